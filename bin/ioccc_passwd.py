@@ -29,7 +29,7 @@ from datetime import datetime, timezone, timedelta
 from iocccsubmit import \
         DEFAULT_GRACE_PERIOD, \
         change_startup_appdir, \
-        delete_username, \
+        delete_usernames, \
         error, \
         generate_password, \
         hash_password, \
@@ -38,6 +38,7 @@ from iocccsubmit import \
         return_last_errmsg, \
         setup_logger, \
         update_username, \
+        username_exists, \
         warning
 
 
@@ -86,9 +87,9 @@ def main():
                         metavar='USER',
                         nargs=1)
     parser.add_argument('-d', '--delete',
-                        help="delete an exist user",
+                        help="delete one or more existing users",
                         metavar='USER',
-                        nargs=1)
+                        nargs='+')
     parser.add_argument('-p', '--password',
                         help="specify the password (def: generate random password)",
                         metavar='PW',
@@ -320,29 +321,30 @@ def main():
                 print("ERROR via print: last_errmsg: <<" + return_last_errmsg() + ">>")
             sys.exit(8)
 
-    # -d user - delete user
+    # -d user ... - delete users
     #
     if args.delete:
 
-        # determine the username to delete
-        #
-        username = args.delete[0]
-
-        # the user must already exist
+        # each user must already exist
         #
-        if not lookup_username(username):
-            info(f'{program}: -d user: no such username: {username}')
-            print("ERROR via print: username does not exist: <<" + username + ">>")
-            print("ERROR via print: last_errmsg: <<" + return_last_errmsg() + ">>")
-            sys.exit(9)
+        for username in args.delete:
+            if not username_exists(username):
+                info(f'{program}: -d user: no such username: {username}')
+                print("ERROR via print: username does not exist: <<" + username + ">>")
+                print("ERROR via print: last_errmsg: <<" + return_last_errmsg() + ">>")
+                sys.exit(9)
 
-        # remove the user
+        # remove the users with a single rewrite of the password file
         #
-        if delete_username(username):
-            info(f'{program}: -d user: deleted username: {username}')
-            print("Notice via print: deleted username: " + username)
+        deleted_users = delete_usernames(args.delete)
+        if deleted_users:
+            for user_dict in deleted_users:
+                username = user_dict['username']
+                info(f'{program}: -d user: deleted username: {username}')
+                print("Notice via print: deleted username: " + username)
             sys.exit(0)
         else:
+            username = " ".join(args.delete)
             error(f'{program}: -d user: failed to delete username: {username} failed: <<{return_last_errmsg()}>>')
             print("ERROR via print: failed to delete username: <<" + username + ">>")
             print("ERROR via print: last_errmsg: <<" + return_last_errmsg() + ">>")
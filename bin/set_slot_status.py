@@ -22,11 +22,11 @@ from iocccsubmit import \
         change_startup_appdir, \
         error, \
         info, \
-        lookup_username, \
         return_last_errmsg, \
         return_slot_json_filename, \
         setup_logger, \
-        update_slot_status
+        update_slot_status, \
+        username_exists
 
 
 # set_slot_status.py version
@@ -86,8 +86,8 @@ def main():
     # verify arguments
     #
     username = args.username
-    if not lookup_username(username):
-        print(f'ERROR via print: lookup_username for  username: {username} '
+    if not username_exists(username):
+        print(f'ERROR via print: username_exists for  username: {username} '
               f'failed: <<{return_last_errmsg()}>>')
         sys.exit(4)
     slot_num = int(args.slot_num)
@@ -19,11 +19,16 @@ from .ioccc_common import \
     DEFAULT_GRACE_PERIOD, \
     DEFAULT_JSON_STATE_TEMPLATE, \
     EMPTY_JSON_SLOT_TEMPLATE, \
+    EMPTY_SLOTS, \
+    HASH_CHUNK_SIZE, \
+    HAVE_ORJSON, \
     INIT_PW_FILE, \
     INIT_PW_FILE_RELATIVE_PATH, \
     INIT_STATE_FILE, \
     INIT_STATE_FILE_RELATIVE_PATH, \
     IP_ADDRESS, \
+    JSON_CACHE_SIZE, \
+    LOCK_RETRY_INTERVAL, \
     LOCK_TIMEOUT, \
     MAX_PASSWORD_LENGTH, \
     MAX_SUBMIT_SLOT, \
@@ -31,6 +36,7 @@ from .ioccc_common import \
     MIN_PASSWORD_LENGTH, \
     NO_COMMENT_VALUE, \
     PASSWORD_VERSION_VALUE, \
+    POSIX_SAFE_PAT, \
     POSIX_SAFE_RE, \
     PW_FILE, \
     PW_FILE_RELATIVE_PATH, \
@@ -41,8 +47,10 @@ from .ioccc_common import \
     PW_WORDS_RELATIVE_PATH, \
     SECRET_FILE, \
     SECRET_FILE_RELATIVE_PATH, \
+    SECRET_TOKEN_BYTES, \
     SHA1_HEXLEN, \
     SHA256_HEXLEN, \
+    SLOT_DATE_FORMAT, \
     SLOT_VERSION_VALUE, \
     STARTUP_CWD, \
     STATE_FILE, \
@@ -51,6 +59,8 @@ from .ioccc_common import \
     STATE_FILE_RELATIVE_PATH, \
     STATE_VERSION_VALUE, \
     TCP_PORT, \
+    UMASK, \
+    UPLOAD_CHUNK_SIZE, \
     USERS_DIR, \
     USERS_DIR_RELATIVE_PATH, \
     VERSION_IOCCC_COMMON, \
@@ -59,18 +69,25 @@ from .ioccc_common import \
     dbg, \
     debug, \
     delete_username, \
+    delete_usernames, \
     error, \
     generate_password, \
     get_all_json_slots, \
     get_json_slot, \
+    hash_file, \
     hash_password, \
     info, \
     initialize_user_tree, \
     ioccc_file_lock, \
     ioccc_file_unlock, \
+    ioccc_json_dumps, \
+    ioccc_json_loads, \
     ioccc_logger, \
     is_proper_password, \
     is_pw_pwned, \
+    json_cache_forget, \
+    json_cache_lookup, \
+    json_cache_store, \
     load_pwfile, \
     lock_slot, \
     lookup_username, \
@@ -79,11 +96,15 @@ from .ioccc_common import \
     read_state, \
     replace_pwfile, \
     return_client_ip, \
+    return_close_date_str, \
+    return_dummy_pwhash, \
     return_last_errmsg, \
     return_secret, \
     return_slot_dir_path, \
     return_slot_json_filename, \
+    return_slot_paths, \
     return_user_dir_path, \
+    save_and_hash_file, \
     setup_logger, \
     unlock_slot, \
     update_password, \
@@ -92,12 +113,15 @@ from .ioccc_common import \
     update_state, \
     update_username, \
     user_allowed_to_login, \
+    username_exists, \
     username_login_allowed, \
+    validate_slot_dict, \
     validate_user_dict, \
     verify_hashed_password, \
     verify_user_password, \
     warn, \
     warning, \
+    write_json_file, \
     write_slot_json
 
 
@@ -23,7 +23,7 @@ NOTE: This flask-login was inspired by the following:
 
 # system imports
 #
-import inspect
+import os
 import re
 import subprocess
 
@@ -39,6 +39,8 @@ import flask_login
 from flask_login import current_user
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
+from jinja2 import TemplateNotFound
+from werkzeug.middleware.profiler import ProfilerMiddleware
 
 
 # import the ioccc common utility code
@@ -62,13 +64,17 @@ from iocccsubmit.ioccc_common import \
     info, \
     initialize_user_tree, \
     is_proper_password, \
+    load_pwfile, \
     lookup_username, \
     must_change_password, \
     return_client_ip, \
+    return_close_date_str, \
+    return_dummy_pwhash, \
     return_last_errmsg, \
     return_secret, \
     return_slot_dir_path, \
     return_user_dir_path, \
+    save_and_hash_file, \
     setup_logger, \
     update_password, \
     update_slot, \
@@ -85,6 +91,18 @@ from iocccsubmit.ioccc_common import \
 VERSION_IOCCC = "2.3.1 2025-01-10"
 
 
+# Form of a submit filename
+#
+# The filename of a submit file is of the form:
+#
+#   submit.username-slot_num.timestamp.txz
+#
+# Group 1 is the username and group 2 is the slot number.  The caller must
+# verify that these are the username and slot number of the upload.
+#
+SUBMIT_FILENAME_RE = re.compile(r'^submit\.([0-9A-Za-z][0-9A-Za-z._+-]*)-([0-9]+)\.[1-9][0-9]{9,}\.txz$')
+
+
 # Configure the application
 #
 application = Flask(__name__,
@@ -101,12 +119,44 @@ application.config['TEMPLATES_AUTO_RELOAD'] = False
 application.secret_key = return_secret()
 
 
-# Set application file paths
+# Profile requests if requested
+#
+# When the IOCCC_PROFILE environment variable is set to a non-empty value, each
+# request is profiled, and the 20 most costly functions are written to stderr.
+#
+# NOTE: Do not enable this in production as profiling slows down every request.
+#
+if os.environ.get('IOCCC_PROFILE'):
+    application.wsgi_app = ProfilerMiddleware(application.wsgi_app, restrictions=[20])
+
+
+# Load and compile the templates
+#
+# The Jinja environment caches compiled templates, and because TEMPLATES_AUTO_RELOAD
+# is False, a cached template is used without checking the template file again.
+# Loading the templates now means that the first request in each process does
+# not have to parse and compile the template it renders.
+#
+# NOTE: We still render via render_template() because the templates use current_user,
+#       which flask_login supplies through a Flask context processor.
+#
+for template_name in ('login.html', 'not-open.html', 'passwd.html', 'submit.html'):
+    try:
+        application.jinja_env.get_template(template_name)
+    except TemplateNotFound:
+        warning(f'template not found: {template_name} under: {APPDIR}/templates')
+
+
+# Setup the cache of users loaded by user_loader
+#
+# Each user_cache value is a tuple of (password file contents, User).  Because
+# load_pwfile() returns the same cached object until the password file changes,
+# a cached User is only reused while the password file it came from is unchanged.
+#
+# When the cache holds USER_CACHE_SIZE users, it is cleared before another user is added.
 #
-with application.test_request_context('/'):
-    url_for('static', filename='style.css')
-    url_for('static', filename='script.js')
-    url_for('static', filename='ioccc.png')
+USER_CACHE_SIZE = 1024
+user_cache = {}
 
 
 # Setup the login manager
@@ -215,8 +265,21 @@ def user_loader(user_id):
     """
     load the user
     """
+
+    # reuse the User if the password file is unchanged since it was loaded
+    #
+    pw_file_json = load_pwfile()
+    cached = user_cache.get(user_id)
+    if cached and pw_file_json and cached[0] is pw_file_json:
+        return cached[1]
+
+    # load the user from the password file
+    #
     user =  User(user_id)
     if user.id:
+        if len(user_cache) >= USER_CACHE_SIZE:
+            user_cache.clear()
+        user_cache[user_id] = (pw_file_json, user)
         return user
     return None
 
@@ -232,20 +295,25 @@ def login():
 
     # setup
     #
-    me = inspect.currentframe().f_code.co_name
+    me = "login"
 
     # case: process / POST
     #
     if request.method == 'POST':
         debug(f'{me}: {return_client_ip()}: '
               f'start POST')
-        form_dict = request.form.to_dict()
-        username = form_dict.get('username')
+        username = request.form.get('username')
+        password = request.form.get('password')
 
         # case: If the user is valid known user
         #
         user = User(username)
         if not user.id:
+
+            # check the password against a dummy hash so that an unknown username
+            # takes about as long to reject as a wrong password
+            #
+            verify_hashed_password(password, return_dummy_pwhash())
             info(f'{me}: {return_client_ip()}: '
                  f'invalid username')
             flash("ERROR: invalid username and/or password")
@@ -253,8 +321,7 @@ def login():
 
         # validate password
         #
-        if verify_hashed_password(form_dict.get('password'),
-                                  user.user_dict['pwhash']):
+        if verify_hashed_password(password, user.user_dict['pwhash']):
 
             # case: If the user is not allowed to login
             #
@@ -281,7 +348,7 @@ def login():
 
         # get the JSON slots for the user and verify we have slots
         #
-        slots = initialize_user_tree(username)
+        slots = initialize_user_tree(username, user.user_dict)
         if not slots:
             error(f'{me}: {return_client_ip()}: '
                   f'username: {username} initialize_user_tree failed: <<{return_last_errmsg()}>>')
@@ -307,11 +374,7 @@ def login():
 
             # case: contest open - both login and user setup are successful
             #
-            return render_template('submit.html',
-                                   flask_login = flask_login,
-                                   username = username,
-                                   etable = slots,
-                                   date=str(close_datetime).replace('+00:00', ''))
+            return render_submit_page(username, slots, close_datetime)
 
         # case: contest is not open - both login and user setup are successful
         #
@@ -332,9 +395,147 @@ def login():
 # pylint: enable=too-many-return-statements
 
 
+def render_submit_page(username, slots, close_datetime):
+    """
+    Render the submission page for a user
+
+    Given:
+        username        login username of the current user
+        slots           JSON for all slots of the user
+        close_datetime  close date of the contest in datetime format
+
+    Returns:
+        rendered submit.html template
+    """
+    return render_template('submit.html',
+                           flask_login = flask_login,
+                           username = username,
+                           etable = slots,
+                           date=return_close_date_str(close_datetime))
+
+
 # pylint: disable=too-many-branches
 # pylint: disable=too-many-return-statements
 #
+def upload_slot_file(me, username, slots):
+    """
+    Upload a file into a user's slot, and render the submission page
+
+    This is the common code for submit() and upload(), called once the user is
+    logged in and their slots have been read.
+
+    Given:
+        me          name of the calling view function
+        username    login username of the current user
+        slots       JSON for all slots of the user
+
+    Returns:
+        rendered submission page, or rendered not open page
+    """
+
+    # verify that the contest is still open
+    #
+    close_datetime = contest_is_open(current_user.user_dict)
+    if not close_datetime:
+        info(f'{me}: {return_client_ip()}: '
+             f'username: {username} IOCCC is not open')
+        flash("The IOCCC is not open.")
+        return render_template('not-open.html',
+                               flask_login = flask_login,
+                               username = username,
+                               etable = slots)
+
+    # verify they selected a slot number to upload
+    #
+    if not 'slot_num' in request.form:
+        debug(f'{me}: {return_client_ip()}: '
+              f'username: {username} No slot selected')
+        flash("No slot selected")
+        return render_submit_page(username, slots, close_datetime)
+    user_input = request.form['slot_num']
+    try:
+        slot_num = int(user_input)
+    except ValueError:
+        debug(f'{me}: {return_client_ip()}: '
+              f'username: {username} Slot number is not a number')
+        flash("Slot number is not a number: " + user_input)
+        return render_submit_page(username, slots, close_datetime)
+    slot_num_str = user_input
+
+    # verify slot number
+    #
+    slot_dir = return_slot_dir_path(username, slot_num)
+    if not slot_dir:
+        error(f'{me}: {return_client_ip()}: '
+              f'username: {username} slot_num: {slot_num} '
+              f'return_slot_dir_path failed: <<{return_last_errmsg()}>>')
+        flash("ERROR: in: " + me + ": return_slot_dir_path failed: <<" + \
+              return_last_errmsg() + ">>")
+        return render_submit_page(username, slots, close_datetime)
+
+    # verify they selected a file to upload
+    #
+    if 'file' not in request.files:
+        debug(f'{me}: {return_client_ip()}: '
+              f'username: {username} No file part')
+        flash('No file part')
+        return render_submit_page(username, slots, close_datetime)
+    file = request.files['file']
+    if file.filename == '':
+        debug(f'{me}: {return_client_ip()}: '
+              f'username: {username} No selected file')
+        flash('No selected file')
+        return render_submit_page(username, slots, close_datetime)
+
+    # verify that the filename is in a submit file form
+    #
+    # The filename must match SUBMIT_FILENAME_RE, and the username and slot number
+    # found in the filename must be those of this user and slot.
+    #
+    re_match = SUBMIT_FILENAME_RE.fullmatch(file.filename)
+    if not re_match or re_match.group(1) != username or re_match.group(2) != slot_num_str:
+        debug(f'{me}: {return_client_ip()}: '
+              f'username: {username} slot_num: {slot_num} invalid form of a filename')
+        re_match_str = f'^submit\\.{re.escape(username)}-{slot_num_str}\\.[1-9][0-9]{{9,}}\\.txz$'
+        flash(f'Filename for slot {slot_num_str} must match this regular expression: {re_match_str}')
+        return render_submit_page(username, slots, close_datetime)
+
+    # save the file in the slot, computing the SHA256 hash as we write the file
+    #
+    upload_file = os.path.join(slot_dir, file.filename)
+    sha256_hex, length = save_and_hash_file(file.stream, upload_file)
+    if not sha256_hex:
+        error(f'{me}: {return_client_ip()}: '
+              f'username: {username} slot_num: {slot_num} save_and_hash_file failed: <<{return_last_errmsg()}>>')
+        flash("ERROR: in: " + me + ": save_and_hash_file failed: <<" + \
+              return_last_errmsg() + ">>")
+        return render_submit_page(username, slots, close_datetime)
+    slot = update_slot(username, slot_num, upload_file, sha256_hex, length)
+    if not slot:
+        error(f'{me}: {return_client_ip()}: '
+              f'username: {username} slot_num: {slot_num} update_slot failed: <<{return_last_errmsg()}>>')
+        flash("ERROR: in: " + me + ": update_slot failed: <<" + \
+              return_last_errmsg() + ">>")
+        return render_submit_page(username, slots, close_datetime)
+
+    # report on the successful upload
+    #
+    info(f'{me}: {return_client_ip()}: '
+         f'username: {username} slot_num: {slot_num} uploaded: {file.filename}')
+    flash("Uploaded file: " + file.filename)
+
+    # both login and user setup are successful
+    #
+    # NOTE: Only the uploaded slot has changed, so we show the slot written
+    #       by update_slot() instead of reading all of the slots again.
+    #
+    slots[slot_num] = slot
+    return render_submit_page(username, slots, close_datetime)
+#
+# pylint: enable=too-many-branches
+# pylint: enable=too-many-return-statements
+
+
 @application.route('/submit', methods = ['GET', 'POST'])
 @flask_login.login_required
 @user_based_limit
@@ -345,7 +546,7 @@ def submit():
 
     # setup
     #
-    me = inspect.currentframe().f_code.co_name
+    me = "submit"
 
     # get username
     #
@@ -406,126 +607,11 @@ def submit():
         flash("User is required to change their password")
         return redirect(url_for('passwd'))
 
-    # verify that the contest is still open
+    # upload the file into the slot
     #
-    close_datetime = contest_is_open(current_user.user_dict)
-    if not close_datetime:
-        info(f'{me}: {return_client_ip()}: '
-             f'IOCCC is not open')
-        flash("The IOCCC is not open.")
-        return render_template('not-open.html',
-                               flask_login = flask_login,
-                               username = username,
-                               etable = slots)
+    return upload_slot_file(me, username, slots)
 
-    # verify they selected a slot number to upload
-    #
-    if not 'slot_num' in request.form:
-        debug(f'{me}: {return_client_ip()}: '
-              f'No slot selected')
-        flash("No slot selected")
-        return render_template('submit.html',
-                               flask_login = flask_login,
-                               username = username,
-                               etable = slots,
-                               date=str(close_datetime).replace('+00:00', ''))
-    user_input = request.form['slot_num']
-    try:
-        slot_num = int(user_input)
-    except ValueError:
-        debug(f'{me}: {return_client_ip()}: '
-              f'Slot number is not a number')
-        flash("Slot number is not a number: " + user_input)
-        return render_template('submit.html',
-                               flask_login = flask_login,
-                               username = username,
-                               etable = slots,
-                               date=str(close_datetime).replace('+00:00', ''))
-    slot_num_str = user_input
 
-    # verify slot number
-    #
-    slot_dir = return_slot_dir_path(username, slot_num)
-    if not slot_dir:
-        error(f'{me}: {return_client_ip()}: '
-              f'username: {username} slot_num: {slot_num} '
-              f'return_slot_dir_path failed: <<{return_last_errmsg()}>>')
-        flash("ERROR: in: " + me + ": return_slot_dir_path failed: <<" + \
-              return_last_errmsg() + ">>")
-        return render_template('submit.html',
-                               flask_login = flask_login,
-                               username = username,
-                               etable = slots,
-                               date=str(close_datetime).replace('+00:00', ''))
-
-    # verify they selected a file to upload
-    #
-    if 'file' not in request.files:
-        debug(f'{me}: {return_client_ip()}: '
-              f'No file part')
-        flash('No file part')
-        return render_template('submit.html',
-                               flask_login = flask_login,
-                               username = username,
-                               etable = slots,
-                               date=str(close_datetime).replace('+00:00', ''))
-    file = request.files['file']
-    if file.filename == '':
-        debug(f'{me}: {return_client_ip()}: '
-              f'No selected file')
-        flash('No selected file')
-        return render_template('submit.html',
-                               flask_login = flask_login,
-                               username = username,
-                               etable = slots,
-                               date=str(close_datetime).replace('+00:00', ''))
-
-    # verify that the filename is in a submit file form
-    #
-    re_match_str = "^submit\\." + username + "-" + slot_num_str + "\\.[1-9][0-9]{9,}\\.txz$"
-    if not re.match(re_match_str, file.filename):
-        debug(f'{me}: {return_client_ip()}: '
-              f'username: {username} slot_num: {slot_num} invalid form of a filename')
-        flash("Filename for slot " + slot_num_str + " must match this regular expression: " + re_match_str)
-        return render_template('submit.html',
-                               flask_login = flask_login,
-                               username = username,
-                               etable = slots,
-                               date=str(close_datetime).replace('+00:00', ''))
-
-    # save the file in the slot
-    #
-    upload_file = user_dir + "/" + slot_num_str  + "/" + file.filename
-    file.save(upload_file)
-    if not update_slot(username, slot_num, upload_file):
-        error(f'{me}: {return_client_ip()}: '
-              f'username: {username} slot_num: {slot_num} update_slot failed: <<{return_last_errmsg()}>>')
-        flash("ERROR: in: " + me + ": update_slot failed: <<" + \
-              return_last_errmsg() + ">>")
-        return render_template('submit.html',
-                               flask_login = flask_login,
-                               username = username,
-                               etable = slots,
-                               date=str(close_datetime).replace('+00:00', ''))
-
-    # report on the successful upload
-    #
-    info(f'{me}: {return_client_ip()}: '
-         f'username: {username} slot_num: {slot_num} uploaded: {file.filename}')
-    flash("Uploaded file: " + file.filename)
-    return render_template('submit.html',
-                           flask_login = flask_login,
-                           username = username,
-                           etable = slots,
-                           date=str(close_datetime).replace('+00:00', ''))
-#
-# pylint: enable=too-many-branches
-# pylint: enable=too-many-return-statements
-
-
-# pylint: disable=too-many-branches
-# pylint: disable=too-many-return-statements
-#
 @application.route('/update', methods=["POST"])
 @flask_login.login_required
 @user_based_limit
@@ -536,7 +622,7 @@ def upload():
 
     # setup
     #
-    me = inspect.currentframe().f_code.co_name
+    me = "upload"
 
     # get username
     #
@@ -583,124 +669,9 @@ def upload():
         flash("User is required to change their password")
         return redirect(url_for('passwd'))
 
-    # verify that the contest is still open
-    #
-    close_datetime = contest_is_open(current_user.user_dict)
-    if not close_datetime:
-        info(f'{me}: {return_client_ip()}: '
-             f'username: {username} IOCCC is not open')
-        flash("The IOCCC is not open.")
-        return render_template('not-open.html',
-                               flask_login = flask_login,
-                               username = username,
-                               etable = slots)
-
-    # verify they selected a slot number to upload
-    #
-    if not 'slot_num' in request.form:
-        debug(f'{me}: {return_client_ip()}: '
-              f'username: {username} No slot selected')
-        flash("No slot selected")
-        return render_template('submit.html',
-                               flask_login = flask_login,
-                               username = username,
-                               etable = slots,
-                               date=str(close_datetime).replace('+00:00', ''))
-    user_input = request.form['slot_num']
-    try:
-        slot_num = int(user_input)
-    except ValueError:
-        debug(f'{me}: {return_client_ip()}: '
-              f'username: {username} Slot number is not a number')
-        flash("Slot number is not a number: " + user_input)
-        return render_template('submit.html',
-                               flask_login = flask_login,
-                               username = username,
-                               etable = slots,
-                               date=str(close_datetime).replace('+00:00', ''))
-    slot_num_str = user_input
-
-    # verify slot number
-    #
-    slot_dir = return_slot_dir_path(username, slot_num)
-    if not slot_dir:
-        error(f'{me}: {return_client_ip()}: '
-              f'username: {username} slot_num: {slot_num} '
-              f'return_slot_dir_path failed: <<{return_last_errmsg()}>>')
-        flash("ERROR: in: " + me + ": return_slot_dir_path failed: <<" + \
-              return_last_errmsg() + ">>")
-        return render_template('submit.html',
-                               flask_login = flask_login,
-                               username = username,
-                               etable = slots,
-                               date=str(close_datetime).replace('+00:00', ''))
-
-    # verify they selected a file to upload
-    #
-    if 'file' not in request.files:
-        debug(f'{me}: {return_client_ip()}: '
-              f'username: {username} No file part')
-        flash('No file part')
-        return render_template('submit.html',
-                               flask_login = flask_login,
-                               username = username,
-                               etable = slots,
-                               date=str(close_datetime).replace('+00:00', ''))
-    file = request.files['file']
-    if file.filename == '':
-        debug(f'{me}: {return_client_ip()}: '
-              f'username: {username} No selected file')
-        flash('No selected file')
-        return render_template('submit.html',
-                               flask_login = flask_login,
-                               username = username,
-                               etable = slots,
-                               date=str(close_datetime).replace('+00:00', ''))
-
-    # verify that the filename is in a submit file form
-    #
-    re_match_str = "^submit\\." + username + "-" + slot_num_str + "\\.[1-9][0-9]{9,}\\.txz$"
-    if not re.match(re_match_str, file.filename):
-        debug(f'{me}: {return_client_ip()}: '
-              f'username: {username} slot_num: {slot_num} invalid form of a filename')
-        flash("Filename for slot " + slot_num_str + " must match this regular expression: " + re_match_str)
-        return render_template('submit.html',
-                               flask_login = flask_login,
-                               username = username,
-                               etable = slots,
-                               date=str(close_datetime).replace('+00:00', ''))
-
-    # save the file in the slot
-    #
-    upload_file = user_dir + "/" + slot_num_str  + "/" + file.filename
-    file.save(upload_file)
-    if not update_slot(username, slot_num, upload_file):
-        error(f'{me}: {return_client_ip()}: '
-              f'username: {username} slot_num: {slot_num} update_slot failed: <<{return_last_errmsg()}>>')
-        flash("ERROR: in: " + me + ": update_slot failed: <<" + \
-              return_last_errmsg() + ">>")
-        return render_template('submit.html',
-                               flask_login = flask_login,
-                               username = username,
-                               etable = slots,
-                               date=str(close_datetime).replace('+00:00', ''))
-
-    # report on the successful upload
-    #
-    info(f'{me}: {return_client_ip()}: '
-         f'username: {username} slot_num: {slot_num} uploaded: {file.filename}')
-    flash("Uploaded file: " + file.filename)
-
-    # both login and user setup are successful
+    # upload the file into the slot
     #
-    return render_template('submit.html',
-                           flask_login = flask_login,
-                           username = username,
-                           etable = get_all_json_slots(username),
-                           date=str(close_datetime).replace('+00:00', ''))
-#
-# pylint: enable=too-many-branches
-# pylint: enable=too-many-return-statements
+    return upload_slot_file(me, username, slots)
 
 
 @application.route('/logout')
@@ -712,7 +683,7 @@ def logout():
 
     # setup
     #
-    me = inspect.currentframe().f_code.co_name
+    me = "logout"
 
     # determine username if possible
     #
@@ -743,7 +714,7 @@ def passwd():
 
     # setup
     #
-    me = inspect.currentframe().f_code.co_name
+    me = "passwd"
 
     # get username
     #
@@ -777,7 +748,6 @@ def passwd():
     if request.method == 'POST':
         debug(f'{me}: {return_client_ip()}: '
               f'start POST')
-        form_dict = request.form.to_dict()
 
         # If the user is allowed to login
         #
@@ -800,19 +770,19 @@ def passwd():
 
             # get form parameters
             #
-            old_password = form_dict.get('old_password')
+            old_password = request.form.get('old_password')
             if not old_password:
                 debug(f'{me}: {return_client_ip()}: '
                       f'username: {username} No current password')
                 flash("ERROR: You must enter your current password")
                 return redirect(url_for('login'))
-            new_password = form_dict.get('new_password')
+            new_password = request.form.get('new_password')
             if not new_password:
                 debug(f'{me}: {return_client_ip()}: '
                       f'username: {username} No new password')
                 flash("ERROR: You must enter a new password")
                 return redirect(url_for('login'))
-            reenter_new_password = form_dict.get('reenter_new_password')
+            reenter_new_password = request.form.get('reenter_new_password')
             if not reenter_new_password:
                 debug(f'{me}: {return_client_ip()}: '
                       f'username: {username} No reentered password')
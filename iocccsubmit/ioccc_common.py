@@ -12,7 +12,7 @@ IMPORTANT NOTE: This code must NOT assume the use of Flask, nor call
                 into utility functions that are command line and not
                 web app related.
 
-IMPORTANT NOTE: To return an error message to a caller, set: ioccc_last_errmsg
+IMPORTANT NOTE: To return an error message to a caller, call: ioccc_last_errmsg.set(errmsg)
 """
 
 # import modules
@@ -29,33 +29,48 @@ import shutil
 import hashlib
 import uuid
 import logging
+import fcntl
+import time
+import stat
+import tempfile
+import threading
 
 
 # import from modules
 #
 from string import Template
+from collections import OrderedDict
+from contextvars import ContextVar
 from os import makedirs, umask
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from random import randrange
 from logging.handlers import SysLogHandler
 from flask import request
 
 
-# For user locking
-#
-# We use the python filelock module.  See:
-#
-#    https://pypi.org/project/filelock/
-#    https://py-filelock.readthedocs.io/en/latest/api.html
-#    https://snyk.io/advisor/python/filelock/example
+# 3rd party imports
 #
-from filelock import Timeout, FileLock
+from werkzeug.security import check_password_hash, generate_password_hash
 
 
-# 3rd party imports
+# For faster JSON decoding
 #
-from werkzeug.security import check_password_hash, generate_password_hash
+# We use the python orjson module to decode JSON when it is available.  See:
+#
+#    https://pypi.org/project/orjson/
+#
+# If the orjson module cannot be imported, we fall back on the json module.
+#
+# NOTE: We always encode JSON with the json module, see ioccc_json_dumps(),
+#       so that the JSON files we write do not depend on if orjson is installed.
+#
+try:
+    import orjson
+    HAVE_ORJSON = True
+except ImportError:
+    HAVE_ORJSON = False
 
 
 ##################
@@ -87,6 +102,12 @@ DEFAULT_GRACE_PERIOD = 72*3600
 #
 DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f%z"
 
+# strftime format of the date that a file was uploaded into a slot
+#
+# This is the UTC date and time to the second, followed by " UTC".
+#
+SLOT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S UTC"
+
 # IP and port when running this code from the command line.
 #
 # When this code be being run under Apache, the wsgi module takes
@@ -154,10 +175,23 @@ PW_WORDS = APPDIR + "/" + PW_WORDS_RELATIVE_PATH
 #
 MIN_SECRET_LEN = 15
 
+# number of random bytes in a SECRET generated on the fly
+#
+# NOTE: secrets.token_hex() returns a string with 2 hex characters per byte.
+#
+SECRET_TOKEN_BYTES = 32
+
 # POSIX safe filename regular expression
 #
 POSIX_SAFE_RE = "^[0-9A-Za-z][0-9A-Za-z._+-]*$"
 
+# POSIX safe filename compiled regular expression
+#
+# NOTE: We use POSIX_SAFE_PAT.fullmatch(string) so that a string with a trailing
+#       newline, which the $ in POSIX_SAFE_RE would otherwise allow, is rejected.
+#
+POSIX_SAFE_PAT = re.compile(POSIX_SAFE_RE)
+
 # slot related JSON values
 #
 NO_COMMENT_VALUE = "mandatory comment: because comments were removed from the original JSON spec"
@@ -265,6 +299,19 @@ SHA256_HEXLEN = 64
 #
 MAX_SUBMIT_SLOT = 9
 
+# empty slot information for each slot number
+#
+# EMPTY_SLOTS[slot_num] is the python dictionary form of EMPTY_JSON_SLOT_TEMPLATE
+# for slot_num.  We form these once, rather than each time a new slot is initialized.
+#
+# IMPORTANT: These python dictionaries are shared.  Use a copy when the slot is to be modified.
+#
+EMPTY_SLOTS = tuple(json.loads(Template(EMPTY_JSON_SLOT_TEMPLATE).substitute(
+                        { 'NO_COMMENT_VALUE': NO_COMMENT_VALUE,
+                          'SLOT_VERSION_VALUE': SLOT_VERSION_VALUE,
+                          'slot_num': str(slot_num) }))
+                    for slot_num in range(0, MAX_SUBMIT_SLOT+1))
+
 # compressed tarball size limit in bytes
 #
 # IMPORTANT:
@@ -279,36 +326,128 @@ MAX_SUBMIT_SLOT = 9
 #
 MAX_TARBALL_LEN = 3999971
 
+# size of the chunks, in bytes, in which files are read when computing a hash
+#
+HASH_CHUNK_SIZE = 64*1024
+
+# size of the chunks, in bytes, in which an uploaded file is copied into its slot
+#
+# An uploaded file is at most MAX_TARBALL_LEN bytes, so with 1 MiB chunks
+# the copy takes only a handful of reads and writes.
+#
+UPLOAD_CHUNK_SIZE = 1024*1024
+
+# file creation mask
+#
+# The umask is a process wide setting, so we set it once when this module is
+# imported rather than before each file or directory is created.  Setting it
+# per call would race with other threads that are creating files.
+#
+# Directories are created with an explicit mode (such as 0o2770 for user and
+# slot directories), and the effective mode is that mode & ~UMASK.
+#
+UMASK = 0o022
+umask(UMASK)
+
 # Lock timeout in seconds
 #
 LOCK_TIMEOUT = 13
 
+# Seconds to wait before trying again to lock a file that is locked by another process
+#
+LOCK_RETRY_INTERVAL = 0.05
+
 # lock state - lock file descriptor or none
 #
-# When ioccc_last_lock_fd is not none, flock is holding a lock on the file ioccc_last_lock_path.
-# When ioccc_last_lock_fd is none, no flock is currently being held.
+# We lock files using fcntl.flock(2) on an open file descriptor of the lock file.
+#
+# The lock state is kept per thread in ioccc_lock_state, a threading.local() object:
+#
+# When ioccc_lock_state.fd is not none, flock is holding a lock on the file ioccc_lock_state.path.
+# When ioccc_lock_state.fd is none, this thread is not holding a flock.
 #
-# When we try lock a file via ioccc_file_lock() and we are holding a lock on another file,
+# IMPORTANT: A threaded web server, such as mod_wsgi, runs requests in threads.
+#            Each thread opens its own lock file descriptor, so flock(2) serializes
+#            threads as well as processes.  A thread must NEVER unlock or close
+#            a lock file descriptor owned by another thread.
+#
+# When we try lock a file via ioccc_file_lock() and this thread is holding a lock on another file,
 # we will force the flock to be released.
 #
 # The lock file only needs to be locked during a brief operation,
-# which are brief in duration.  Moreover this server is NOT multi-threaded.
-# We NEVER want to lock more than one file at a time.
+# which are brief in duration.  We NEVER want to lock more than one file at a time.
 #
 # Nevertheless if, before we start, say. a slot operation AND before we attempt
-# to lock the slot lock file, we discover that some other file is still locked
-# (due to unexpected asynchronous event or exception, or code bug), we
+# to lock the slot lock file, we discover that this thread still has some other
+# file locked (due to unexpected asynchronous event or exception, or code bug), we
 # will force that previous lock to be unlocked.
 #
-# pylint: disable-next=global-statement,invalid-name
-ioccc_last_lock_fd = None         # lock file descriptor, or None
-# pylint: disable-next=global-statement,invalid-name
-ioccc_last_lock_path = None       # path of the file that is locked, or None
-# pylint: disable-next=global-statement,invalid-name
-ioccc_last_errmsg = ""            # recent error message or empty string
+ioccc_lock_state = threading.local()
+ioccc_lock_state.fd = None          # lock file descriptor, or None
+ioccc_lock_state.path = None        # path of the file that is locked, or None
+# recent error message or empty string
+#
+# ioccc_last_errmsg is a context variable so that each thread, such as each thread
+# of a threaded web server, sees only the error messages that it set.
+#
+# pylint: disable-next=invalid-name
+ioccc_last_errmsg = ContextVar("ioccc_last_errmsg", default="")
 # pylint: disable-next=global-statement,invalid-name
 ioccc_pw_words = []
 
+# JSON file cache - parsed JSON file contents keyed by filename
+#
+# Each ioccc_json_cache value is a tuple of:
+#
+#   (st_mtime_ns, st_size, python object of the JSON file contents)
+#
+# A cached value is only used while the st_mtime_ns and st_size of the file are unchanged.
+# Functions in this file that rewrite a cached JSON file call json_cache_forget().
+#
+# The cache is kept in least recently used order.  Once the cache holds JSON_CACHE_SIZE
+# files, the least recently used file is discarded, so the cache does not keep
+# the slot files of every user for the life of the process.
+#
+# IMPORTANT: Cached python objects are shared.  Callers must NOT modify them.
+#
+JSON_CACHE_SIZE = 1024
+# pylint: disable-next=invalid-name
+ioccc_json_cache = OrderedDict()
+
+# parsed state file dates
+#
+# When not None, ioccc_state_dates is a tuple of:
+#
+#   (open_date string, close_date string, open_datetime, close_datetime, close_date display string)
+#
+# read_state() reuses the datetime values while the open_date and close_date
+# strings found in the state file are unchanged.  The close_date display string
+# is what return_close_date_str() hands to the templates.
+#
+# pylint: disable-next=invalid-name
+ioccc_state_dates = None
+
+# users whose directory tree has been formed by this process
+#
+# Once initialize_user_tree() has formed the user directory and all of the slot
+# directories for a username, that username is added to this set.  Later calls
+# to initialize_user_tree() for that username skip the makedirs() system calls.
+#
+# pylint: disable-next=invalid-name
+ioccc_user_dirs_ready = set()
+
+# usernames of the password file
+#
+# When not None, ioccc_pw_usernames is a tuple of:
+#
+#   (password file contents from load_pwfile(), frozenset of the usernames in it)
+#
+# Because load_pwfile() returns the same cached object until the password file changes,
+# the frozenset is only reused while the password file it came from is unchanged.
+#
+# pylint: disable-next=invalid-name
+ioccc_pw_usernames = None
+
 # IOCCC logger - how we log events
 #
 # When ioccc_logger is None, no logging is performed,
@@ -321,29 +460,181 @@ ioccc_pw_words = []
 ioccc_logger = None
 
 
+def ioccc_json_dumps(obj, compact=False):
+    """
+    Encode a python object as JSON
+
+    We use the json module with a 4 space indent, restricted to ASCII.
+
+    NOTE: We do not use orjson to encode, because orjson can only indent by 2 spaces
+          and does not restrict its output to ASCII.  The JSON files we write must
+          be the same if orjson is installed or not.
+
+    Given:
+        obj         python object to encode
+        compact     True ==> encode without indenting or whitespace between tokens
+
+    Returns:
+        JSON encoding of obj, followed by a newline, as bytes
+    """
+
+    # encode with json
+    #
+    if compact:
+        return json.dumps(obj, ensure_ascii=True, separators=(',', ':')).encode('utf-8') + b'\n'
+    return json.dumps(obj, ensure_ascii=True, indent=4).encode('utf-8') + b'\n'
+
+
+def ioccc_json_loads(data):
+    """
+    Decode JSON into a python object
+
+    When the orjson module is available, we use orjson, otherwise we use the json module.
+
+    Given:
+        data    JSON as bytes or as a string
+
+    Returns:
+        decoded python object
+
+    NOTE: Malformed JSON raises a ValueError (both orjson.JSONDecodeError
+          and json.JSONDecodeError are subclasses of ValueError).
+    """
+
+    # case: decode with orjson
+    #
+    if HAVE_ORJSON:
+        return orjson.loads(data)
+
+    # case: decode with json
+    #
+    return json.loads(data)
+
+
+def json_cache_lookup(json_file):
+    """
+    Return the cached contents of a JSON file if the file is unchanged
+
+    Given:
+        json_file   JSON file
+
+    Returns:
+        None        JSON file is not cached, or
+                    JSON file has changed since it was cached, or
+                    unable to stat the JSON file
+        != None     cached JSON file contents as a python object
+    """
+
+    # setup
+    #
+    me = "json_cache_lookup"
+    debug(f'{me}: start')
+
+    # check the cache
+    #
+    entry = ioccc_json_cache.get(json_file)
+    if not entry:
+        return None
+
+    # the cached value must be for an unchanged file
+    #
+    try:
+        file_stat = os.stat(json_file)
+    except OSError:
+        ioccc_json_cache.pop(json_file, None)
+        return None
+    if entry[0] != file_stat.st_mtime_ns or entry[1] != file_stat.st_size:
+        ioccc_json_cache.pop(json_file, None)
+        return None
+
+    # note that the JSON file was recently used
+    #
+    # NOTE: Another thread may have just removed the JSON file from the cache.
+    #
+    try:
+        ioccc_json_cache.move_to_end(json_file)
+    except KeyError:
+        pass
+
+    # return cached JSON file contents
+    #
+    debug(f'{me}: cache hit for json_file: {json_file}')
+    return entry[2]
+
+
+def json_cache_store(json_file, file_stat, obj):
+    """
+    Cache the contents of a JSON file
+
+    Given:
+        json_file   JSON file
+        file_stat   os.stat_result of json_file from before json_file was read
+        obj         JSON file contents as a python object
+    """
+
+    # setup
+    #
+    me = "json_cache_store"
+    debug(f'{me}: start')
+
+    # cache the JSON file contents as the most recently used
+    #
+    ioccc_json_cache[json_file] = (file_stat.st_mtime_ns, file_stat.st_size, obj)
+    try:
+        ioccc_json_cache.move_to_end(json_file)
+    except KeyError:
+        pass
+
+    # discard the least recently used JSON files
+    #
+    while len(ioccc_json_cache) > JSON_CACHE_SIZE:
+        try:
+            ioccc_json_cache.popitem(last=False)
+        except KeyError:
+            break
+
+
+def json_cache_forget(json_file):
+    """
+    Remove a JSON file from the cache
+
+    Given:
+        json_file   JSON file
+    """
+
+    # setup
+    #
+    me = "json_cache_forget"
+    debug(f'{me}: start')
+
+    # remove JSON file contents, if cached
+    #
+    ioccc_json_cache.pop(json_file, None)
+
+
 def return_last_errmsg():
     """
     Return the recent error message or empty string
 
     Returns:
-        ioccc_last_errmsg as a string
+        ioccc_last_errmsg value as a string
     """
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
-    me = inspect.currentframe().f_code.co_name
+    me = "return_last_errmsg"
     debug(f'{me}: start')
 
-    # paranoia - if ioccc_last_errmsg is not a string, return as string version
+    # paranoia - if ioccc_last_errmsg value is not a string, return as string version
     #
-    if not isinstance(ioccc_last_errmsg, str):
-        ioccc_last_errmsg = str(ioccc_last_errmsg)
+    errmsg = ioccc_last_errmsg.get()
+    if not isinstance(errmsg, str):
+        errmsg = str(errmsg)
+        ioccc_last_errmsg.set(errmsg)
 
     # return string
     #
-    return ioccc_last_errmsg
+    return errmsg
 
 
 def return_client_ip() -> str:
@@ -353,7 +644,7 @@ def return_client_ip() -> str:
 
     # setup
     #
-    me = inspect.currentframe().f_code.co_name
+    me = "return_client_ip"
     ip = "((UNKNOWN))"
 
     # paranoia - handle if we do not have a request
@@ -429,7 +720,6 @@ def change_startup_appdir(topdir):
     # setup
     #
     # pylint: disable=global-statement
-    global ioccc_last_errmsg
     global APPDIR
     global PW_FILE
     global INIT_PW_FILE
@@ -448,14 +738,14 @@ def change_startup_appdir(topdir):
     # paranoia - if ioccc_last_errmsg is not a string, return as string version
     #
     if not isinstance(topdir, str):
-        ioccc_last_errmsg = "ERROR: in " + me + ": topdir arg is not a string"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": topdir arg is not a string")
         error(f'{me}: topdir arg is not a string')
         return False
 
     # topdir must be a directory
     #
     if not Path(topdir).is_dir():
-        ioccc_last_errmsg = "ERROR: in " + me + ": topdir is not a directory: " + topdir
+        ioccc_last_errmsg.set("ERROR: in " + me + ": topdir is not a directory: " + topdir)
         error(f'{me}: topdir arg is not a directory')
         return False
 
@@ -478,6 +768,10 @@ def change_startup_appdir(topdir):
     #
     # pylint: enable=redefined-outer-name
 
+    # directories formed under the previous APPDIR no longer apply
+    #
+    ioccc_user_dirs_ready.clear()
+
     # assume all is well
     #
     return True
@@ -503,29 +797,27 @@ def return_user_dir_path(username):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
-    me = inspect.currentframe().f_code.co_name
+    me = "return_user_dir_path"
     debug(f'{me}: start')
 
     # paranoia - username arg must be a string
     #
     if not isinstance(username, str):
-        ioccc_last_errmsg = f'{me}: username arg is not a string'
+        ioccc_last_errmsg.set(f'{me}: username arg is not a string')
         info(f'{me}: username arg is not a string')
         return None
 
     # paranoia - username cannot be too short
     #
     if len(username) < MIN_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         info(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         return None
 
     # paranoia - username cannot be too long
     #
     if len(username) > MAX_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         info(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         return None
 
@@ -534,8 +826,8 @@ def return_user_dir_path(username):
     # This also prevents username with /, and prevents it from being empty string,
     # thus one cannot create a username with system cracking "funny business".
     #
-    if not re.match(POSIX_SAFE_RE, username):
-        ioccc_last_errmsg = "ERROR: in " + me + ": username arg not POSIX safe"
+    if not POSIX_SAFE_PAT.fullmatch(username):
+        ioccc_last_errmsg.set("ERROR: in " + me + ": username arg not POSIX safe")
         info(f'{me}: username arg not POSIX safe')
         return None
 
@@ -564,29 +856,27 @@ def return_slot_dir_path(username, slot_num):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
-    me = inspect.currentframe().f_code.co_name
+    me = "return_slot_dir_path"
     debug(f'{me}: start')
 
     # paranoia - username arg must be a string
     #
     if not isinstance(username, str):
-        ioccc_last_errmsg = f'{me}: username arg is not a string'
+        ioccc_last_errmsg.set(f'{me}: username arg is not a string')
         info(f'{me}: username arg is not a string')
         return None
 
     # paranoia - username cannot be too short
     #
     if len(username) < MIN_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         info(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         return None
 
     # paranoia - username cannot be too long
     #
     if len(username) > MAX_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         info(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         return None
 
@@ -595,15 +885,15 @@ def return_slot_dir_path(username, slot_num):
     # This also prevents username with /, and prevents it from being empty string,
     # thus one cannot create a username with system cracking "funny business".
     #
-    if not re.match(POSIX_SAFE_RE, username):
-        ioccc_last_errmsg = "ERROR: in " + me + ": username arg not POSIX safe"
+    if not POSIX_SAFE_PAT.fullmatch(username):
+        ioccc_last_errmsg.set("ERROR: in " + me + ": username arg not POSIX safe")
         info(f'{me}: username arg not POSIX safe')
         return None
 
     # paranoia - slot_num arg must be an integer
     #
     if not isinstance(slot_num, int):
-        ioccc_last_errmsg = f'{me}: slot_num arg is not an int'
+        ioccc_last_errmsg.set(f'{me}: slot_num arg is not an int')
         info(f'{me}: slot_num arg is not an int')
         return None
 
@@ -617,8 +907,8 @@ def return_slot_dir_path(username, slot_num):
     # paranoia - must be a valid slot number
     #
     if (slot_num < 0 or slot_num > MAX_SUBMIT_SLOT):
-        ioccc_last_errmsg = "ERROR: in " + me + ": invalid slot number: " + str(slot_num) + \
-                        " for username: <<" + username + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": invalid slot number: " + str(slot_num) + \
+                        " for username: <<" + username + ">>")
         error(f'{me}: invalid slot number for username: {username} slot_num: {slot_num}')
         return None
 
@@ -649,7 +939,7 @@ def return_slot_json_filename(username, slot_num):
 
     # setup
     #
-    me = inspect.currentframe().f_code.co_name
+    me = "return_slot_json_filename"
     debug(f'{me}: start')
 
     # paranoia - username arg must be a string
@@ -675,7 +965,7 @@ def return_slot_json_filename(username, slot_num):
     # This also prevents username with /, and prevents it from being empty string,
     # thus one cannot create a username with system cracking "funny business".
     #
-    if not re.match(POSIX_SAFE_RE, username):
+    if not POSIX_SAFE_PAT.fullmatch(username):
         info(f'{me}: username arg not POSIX safe')
         return None
 
@@ -685,23 +975,50 @@ def return_slot_json_filename(username, slot_num):
         info(f'{me}: slot_num arg is not an int')
         return None
 
-    # determine slot directory name
+    # determine the JSON filename for this given slot
     #
-    user_dir = return_user_dir_path(username)
-    if not user_dir:
-        error(f'{me}: return_user_dir_path failed for username: {username}')
+    _, slot_json_file = return_slot_paths(username, slot_num)
+    if not slot_json_file:
+        error(f'{me}: return_slot_paths failed for username: {username}')
         return None
+    return slot_json_file
+#
+# pylint: enable=too-many-return-statements
+
+
+def return_slot_paths(username, slot_num):
+    """
+    Return both the slot directory path and the slot JSON filename of a user's slot
+
+    The username and slot number are checked once by return_slot_dir_path(),
+    rather than once for each path as when calling return_slot_dir_path()
+    and then return_slot_json_filename().
+
+    Given:
+        username    IOCCC submit server username
+        slot_num    slot number for a given username
+
+    Returns:
+        None, None ==> invalid slot number or invalid user directory
+        slot_dir, slot_json_file ==> slot directory path and path of the JSON filename
+                                     for this user's slot (either may not yet exist)
+    """
+
+    # setup
+    #
+    me = "return_slot_paths"
+    debug(f'{me}: start')
+
+    # determine slot directory name
+    #
     slot_dir = return_slot_dir_path(username, slot_num)
     if not slot_dir:
         error(f'{me}: return_slot_dir_path failed for username: {username}')
-        return None
+        return None, None
 
-    # determine the JSON filename for this given slot
+    # return the slot directory and the JSON filename for this given slot
     #
-    slot_json_file = slot_dir + "/slot.json"
-    return slot_json_file
-#
-# pylint: enable=too-many-return-statements
+    return slot_dir, slot_dir + "/slot.json"
 
 
 def ioccc_file_lock(file_lock):
@@ -711,11 +1028,14 @@ def ioccc_file_lock(file_lock):
     A side effect of locking a file is that the file will be created with
     more 0664 it it does not exist.
 
+    The lock is an exclusive fcntl.flock(2) lock on an open file descriptor
+    of the file.  The lock is held until ioccc_file_unlock() is called.
+
     Given:
         file_lock               the filename to lock
 
         If the filename does not exist, it will be created.
-        If another file is currently unlocked, force the older lock to be unlocked.
+        If this thread currently has another file locked, force the older lock to be unlocked.
         Lock the new file.
         Register the lock.
 
@@ -727,28 +1047,16 @@ def ioccc_file_lock(file_lock):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_lock_fd
-    # pylint: disable-next=global-statement
-    global ioccc_last_lock_path
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
     me = inspect.currentframe().f_code.co_name
     debug(f'{me}: start')
 
-    # be sure the lock file exists
+    # Force any stale lock held by this thread to become unlocked
     #
-    try:
-        Path(file_lock).touch(mode=0o664, exist_ok=True)
-
-    except OSError as errcode:
-        ioccc_last_errmsg = "ERROR: in " + me + ": failed touch (mode=0o664, exist_ok=True): " + file_lock + \
-                      " exception: " + str(errcode)
-        error(f'{me}: touch file_lock: {file_lock} failed: <<{str(errcode)}>>')
-        return None
-
-    # Force any stale lock to become unlocked
+    # NOTE: A threading.local() attribute set in another thread is not seen by
+    #       this thread, so we start from None when this thread has not locked before.
     #
+    ioccc_last_lock_fd = getattr(ioccc_lock_state, 'fd', None)
+    ioccc_last_lock_path = getattr(ioccc_lock_state, 'path', None)
     if ioccc_last_lock_fd:
 
         # Carp
@@ -756,52 +1064,76 @@ def ioccc_file_lock(file_lock):
         if not ioccc_last_lock_path:
             ioccc_last_lock_path = "((no-ioccc_last_lock_path))"
             # fall thru
-        ioccc_last_errmsg = "Warning: in " + me + ": forcing stale unlock: " + ioccc_last_lock_path
+        ioccc_last_errmsg.set("Warning: in " + me + ": forcing stale unlock: " + ioccc_last_lock_path)
         warning(f'{me}: forcing stale unlock: ioccc_last_lock_path: {ioccc_last_lock_path}')
 
         # Force previous stale lock to become unlocked
         #
         try:
-            ioccc_last_lock_fd.release(force=True)
+            fcntl.flock(ioccc_last_lock_fd, fcntl.LOCK_UN)
+            os.close(ioccc_last_lock_fd)
 
         except OSError as errcode:
             # We give up as we cannot force the unlock
             #
-            ioccc_last_errmsg = "Warning: in " + me + ": failed to force stale unlock: " + ioccc_last_lock_path + \
-                          " exception: " + str(errcode)
+            ioccc_last_errmsg.set("Warning: in " + me + ": failed to force stale unlock: " + ioccc_last_lock_path + \
+                          " exception: " + str(errcode))
             warning(f'{me}: stale unlock ioccc_last_lock_path failed: <<{str(errcode)}>>')
             # fall thru
 
         # clear the past lock
         #
-        ioccc_last_lock_fd = None
-        ioccc_last_lock_path = None
+        ioccc_lock_state.fd = None
+        ioccc_lock_state.path = None
         # fall thru
 
-    # Lock the file
+    # open the lock file, creating it if it does not exist
     #
     try:
-        with FileLock(file_lock, timeout=LOCK_TIMEOUT, is_singleton=True) as lock_fd:
+        lock_fd = os.open(file_lock, os.O_CREAT | os.O_WRONLY, 0o664)
+
+    except OSError as errcode:
+        ioccc_last_errmsg.set("ERROR: in " + me + ": failed to open lock file: " + file_lock + \
+                      " exception: " + str(errcode))
+        error(f'{me}: open file_lock: {file_lock} failed: <<{str(errcode)}>>')
+        return None
+
+    # Lock the file
+    #
+    # We try a non-blocking lock, and if another process holds the lock, we
+    # wait LOCK_RETRY_INTERVAL seconds and try again, for up to LOCK_TIMEOUT seconds.
+    #
+    lock_deadline = time.monotonic() + LOCK_TIMEOUT
+    while True:
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            break
 
-            # note our new lock
+        except BlockingIOError:
+
+            # case: too too long to get the lock
             #
-            ioccc_last_lock_fd = lock_fd
-            ioccc_last_lock_path = file_lock
+            if time.monotonic() >= lock_deadline:
+                os.close(lock_fd)
+                ioccc_last_errmsg.set("Warning: in " + me + ": timeout on lock for: " + file_lock)
+                error(f'{me}: lock timeout file_lock: {file_lock}')
+                return None
 
-    except Timeout:
+            # wait and try again
+            #
+            time.sleep(LOCK_RETRY_INTERVAL)
 
-        # too too long to get the lock
-        #
-        ioccc_last_errmsg = "Warning: in " + me + ": timeout on lock for: " + ioccc_last_lock_path
-        error(f'{me}: lock timeout file_lock: {file_lock}')
-        return None
+        except OSError as errcode:
+            os.close(lock_fd)
+            ioccc_last_errmsg.set("ERROR: in " + me + ": failed to flock(LOCK_EX): " + \
+                                file_lock + " exception: " + str(errcode))
+            error(f'{me}: lock of file_lock {file_lock} failed: <<{str(errcode)}>>')
+            return None
 
-    except OSError as errcode:
-        ioccc_last_errmsg = "ERROR: in " + me + \
-                            ": failed to FileLock(file_lock, timeout=LOCK_TIMEOUT, is_singleton=True): " + \
-                            file_lock + " exception: " + str(errcode)
-        error(f'{me}: lock of file_lock {file_lock} failed: <<{str(errcode)}>>')
-        return None
+    # note our new lock
+    #
+    ioccc_lock_state.fd = lock_fd
+    ioccc_lock_state.path = file_lock
 
     # return the lock success
     #
@@ -813,7 +1145,8 @@ def ioccc_file_unlock():
     """
     unlock a previously locked file
 
-    A file locked via ioccc_file_lock(file_lock) is unlocked using the last registered lock.
+    A file locked via ioccc_file_lock(file_lock) is unlocked using the last lock registered
+    by this thread.
 
     Returns:
         True     previously locked file has been unlocked
@@ -826,15 +1159,10 @@ def ioccc_file_unlock():
     me = inspect.currentframe().f_code.co_name
     debug(f'{me}: start')
 
-    # declare global use
+    # obtain the lock held by this thread
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_lock_fd
-    # pylint: disable-next=global-statement
-    global ioccc_last_lock_path
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
-    me = inspect.currentframe().f_code.co_name
+    ioccc_last_lock_fd = getattr(ioccc_lock_state, 'fd', None)
+    ioccc_last_lock_path = getattr(ioccc_lock_state, 'path', None)
 
     # case: no file was previously unlocked
     #
@@ -842,28 +1170,29 @@ def ioccc_file_unlock():
     if not ioccc_last_lock_path:
         ioccc_last_lock_path = "((no-ioccc_last_lock_path))"
     if not ioccc_last_lock_fd:
-        ioccc_last_errmsg = "ERROR: in " + me + ": no lock for: " + ioccc_last_lock_path
+        ioccc_last_errmsg.set("ERROR: in " + me + ": no lock for: " + ioccc_last_lock_path)
         warning(f'{me}: no lock for ioccc_last_lock_path: {ioccc_last_lock_path}')
 
     # Unlock the file
     #
     else:
         try:
-            ioccc_last_lock_fd.release(force=True)
+            fcntl.flock(ioccc_last_lock_fd, fcntl.LOCK_UN)
+            os.close(ioccc_last_lock_fd)
             sucess = True
 
         except OSError as errcode:
             # We give up as we cannot force the unlock
             #
-            ioccc_last_errmsg = "Warning: in " + me + ": failed to unlock: " + ioccc_last_lock_path + \
-                          " exception: " + str(errcode)
+            ioccc_last_errmsg.set("Warning: in " + me + ": failed to unlock: " + ioccc_last_lock_path + \
+                          " exception: " + str(errcode))
             warning(f'{me}: failed to unlock ioccc_last_lock_path: {ioccc_last_lock_path}')
             # fall thru
 
     # Clear any previous lock
     #
-    ioccc_last_lock_fd = None
-    ioccc_last_lock_path = None
+    ioccc_lock_state.fd = None
+    ioccc_lock_state.path = None
 
     # Return the unlock success or failure
     #
@@ -878,18 +1207,27 @@ def load_pwfile():
     Obtain a lock for password file before opening and reading the password file.
     We release the lock for the password file afterwards.
 
+    The password file contents are cached until the password file changes.
+
     Returns:
         None ==> unable to read the JSON in the password file
         != None ==> password file contents as a python dictionary
+
+    IMPORTANT: The returned python dictionary is shared with the cache.
+               The caller must NOT modify it.
     """
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
-    me = inspect.currentframe().f_code.co_name
+    me = "load_pwfile"
     debug(f'{me}: start')
 
+    # return the cached password file contents if the password file is unchanged
+    #
+    pw_file_json = json_cache_lookup(PW_FILE)
+    if pw_file_json:
+        return pw_file_json
+
     # Lock the password file
     #
     pw_lock_fd = ioccc_file_lock(PW_LOCK)
@@ -903,8 +1241,8 @@ def load_pwfile():
         try:
             shutil.copy2(INIT_PW_FILE, PW_FILE, follow_symlinks=True)
         except OSError as errcode:
-            ioccc_last_errmsg = "ERROR: in " + me + " #0: cannot cp -p " + INIT_PW_FILE + \
-                            " " + PW_FILE + " exception: " + str(errcode)
+            ioccc_last_errmsg.set("ERROR: in " + me + " #0: cannot cp -p " + INIT_PW_FILE + \
+                            " " + PW_FILE + " exception: " + str(errcode))
             error(f'{me}: cp -p {INIT_PW_FILE} {PW_FILE} failed: <<{str(errcode)}>>')
             ioccc_file_unlock()
             return None
@@ -912,11 +1250,12 @@ def load_pwfile():
     # load the password file and unlock
     #
     try:
-        with open(PW_FILE, 'r', encoding="utf-8") as j_pw:
+        pw_stat = os.stat(PW_FILE)
+        with open(PW_FILE, 'rb') as j_pw:
 
             # read the JSON of the password file
             #
-            pw_file_json = json.load(j_pw)
+            pw_file_json = ioccc_json_loads(j_pw.read())
 
             # firewall
             #
@@ -924,15 +1263,15 @@ def load_pwfile():
 
                 # we have no JSON to return
                 #
-                ioccc_last_errmsg = "ERROR: in " + me + ": failed to read " + PW_FILE + \
-                                    " exception: " + str(errcode)
+                ioccc_last_errmsg.set("ERROR: in " + me + ": failed to read " + PW_FILE + \
+                                    " exception: " + str(errcode))
                 error(f'{me}: read {PW_FILE} failed: <<{str(errcode)}>>')
                 ioccc_file_unlock()
                 return None
 
     except OSError as errcode:
-        ioccc_last_errmsg = "ERROR: in " + me + ": cannot read password file" + \
-                        " errcode: " + str(errcode)
+        ioccc_last_errmsg.set("ERROR: in " + me + ": cannot read password file" + \
+                        " errcode: " + str(errcode))
         error(f'{me}: open for reading {PW_FILE} failed: <<{str(errcode)}>>')
 
         # we have no JSON to return
@@ -940,8 +1279,9 @@ def load_pwfile():
         ioccc_file_unlock()
         return None
 
-    # return the password JSON data as a python dictionary
+    # cache and return the password JSON data as a python dictionary
     #
+    json_cache_store(PW_FILE, pw_stat, pw_file_json)
     ioccc_file_unlock()
     debug(f'{me}: loaded password file: {PW_FILE}')
     return pw_file_json
@@ -964,8 +1304,6 @@ def replace_pwfile(pw_file_json):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
     me = inspect.currentframe().f_code.co_name
     debug(f'{me}: start')
 
@@ -978,33 +1316,8 @@ def replace_pwfile(pw_file_json):
 
     # rewrite the password file with the pw_file_json and unlock
     #
-    try:
-        with open(PW_FILE, mode="w", encoding="utf-8") as j_pw:
-            j_pw.write(json.dumps(pw_file_json, ensure_ascii=True, indent=4))
-            j_pw.write('\n')
-
-            # close and unlock the password file
-            #
-            # NOTE: We explicitly manage the close because we just did a write
-            #       and we want to catch the case where a write buffer may have
-            #       not been fully flushed to the file.
-            #
-            try:
-                j_pw.close()
-
-            except OSError as errcode:
-                ioccc_last_errmsg = "ERROR: in " + me + ": failed to close: " + PW_FILE + \
-                                    " exception: " + str(errcode)
-                error(f'{me}: close for writing {PW_FILE} failed: <<{str(errcode)}>>')
-                ioccc_file_unlock()
-                return False
-
-    except OSError:
-
-        # unlock the password file
-        #
-        ioccc_last_errmsg = "ERROR: in " + me + ": unable to write password file"
-        error(f'{me}: close for writing {PW_FILE} failed: <<{str(errcode)}>>')
+    if not write_json_file(PW_FILE, pw_file_json):
+        error(f'{me}: write_json_file failed for PW_FILE: {PW_FILE}')
         ioccc_file_unlock()
         return False
 
@@ -1033,22 +1346,20 @@ def validate_user_dict(user_dict):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
-    me = inspect.currentframe().f_code.co_name
+    me = "validate_user_dict"
     debug(f'{me}: start')
 
     # sanity check argument
     #
     if not isinstance(user_dict, dict):
-        ioccc_last_errmsg = "ERROR: in " + me + ": user_dict arg is not a python dictionary"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": user_dict arg is not a python dictionary")
         error(f'{me}: user_dict arg is not a python dictionary')
         return False
 
     # obtain the username
     #
     if not isinstance(user_dict['username'], str):
-        ioccc_last_errmsg = "ERROR: in " + me + ": username is not a string: <<" + str(user_dict['username']) + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": username is not a string: <<" + str(user_dict['username']) + ">>")
         error(f'{me}: username is not a string')
         return False
     username = user_dict['username']
@@ -1056,21 +1367,21 @@ def validate_user_dict(user_dict):
     # paranoia - username value is not a string
     #
     if not isinstance(username, str):
-        ioccc_last_errmsg = f'{me}: username value is not a string'
+        ioccc_last_errmsg.set(f'{me}: username value is not a string')
         info(f'{me}: username value is not a string')
         return False
 
     # paranoia - username cannot be too short
     #
     if len(username) < MIN_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username value is too short: {len(username)} < {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username value is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         info(f'{me}: username value is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         return False
 
     # paranoia - username cannot be too long
     #
     if len(username) > MAX_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username value is too long: {len(username)} > {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username value is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         info(f'{me}: username value is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         return False
 
@@ -1079,26 +1390,26 @@ def validate_user_dict(user_dict):
     # This also prevents username with /, and prevents it from being empty string,
     # thus one cannot create a username with system cracking "funny business".
     #
-    if not re.match(POSIX_SAFE_RE, username):
-        ioccc_last_errmsg = "ERROR: in " + me + ": username value not POSIX safe"
+    if not POSIX_SAFE_PAT.fullmatch(username):
+        ioccc_last_errmsg.set("ERROR: in " + me + ": username value not POSIX safe")
         info(f'{me}: username value not POSIX safe')
         return False
 
     # sanity check user no_comment
     #
     if not user_dict['no_comment']:
-        ioccc_last_errmsg = "ERROR: in " + me + ": missing no_comment for username : <<" + \
-                            username + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": missing no_comment for username : <<" + \
+                            username + ">>")
         error(f'{me}: missing no_comment for username: {username}')
         return False
     if not isinstance(user_dict['no_comment'], str):
-        ioccc_last_errmsg = "ERROR: in " + me + ": no_comment is not a string for username : <<" + \
-                            username + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": no_comment is not a string for username : <<" + \
+                            username + ">>")
         error(f'{me}: no_comment not a string for username: {username}')
         return False
     if user_dict["no_comment"] != NO_COMMENT_VALUE:
-        ioccc_last_errmsg = "ERROR: in " + me + ": invalid JSON no_comment username : <<" + \
-                            username + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": invalid JSON no_comment username : <<" + \
+                            username + ">>")
         error(f'{me}: invalid JSON no_comment for username: {username} '
               f'user_dict["no_comment"]: {user_dict["no_comment"]} != '
               f'NO_COMMENT_VALUE: {NO_COMMENT_VALUE}')
@@ -1107,18 +1418,18 @@ def validate_user_dict(user_dict):
     # sanity check user iocccpasswd_format_version
     #
     if not user_dict['iocccpasswd_format_version']:
-        ioccc_last_errmsg = "ERROR: in " + me + ": missing iocccpasswd_format_version for username : <<" + \
-                            username + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": missing iocccpasswd_format_version for username : <<" + \
+                            username + ">>")
         error(f'{me}: missing iocccpasswd_format_version for username: {username}')
         return False
     if not isinstance(user_dict['iocccpasswd_format_version'], str):
-        ioccc_last_errmsg = "ERROR: in " + me + ": iocccpasswd_format_version is not a string for username : <<" + \
-                            username + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": iocccpasswd_format_version is not a string for username : <<" + \
+                            username + ">>")
         error(f'{me}: iocccpasswd_format_version not a string for username: {username}')
         return False
     if user_dict["iocccpasswd_format_version"] != PASSWORD_VERSION_VALUE:
-        ioccc_last_errmsg = "ERROR: in " + me + ": invalid iocccpasswd_format_version for username : <<" + \
-                            username + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": invalid iocccpasswd_format_version for username : <<" + \
+                            username + ">>")
         error(f'{me}: invalid iocccpasswd_format_version for username: {username} '
               f'user_dict["iocccpasswd_format_version"]: {user_dict["iocccpasswd_format_version"]} != '
               f'PASSWORD_VERSION_VALUE: {PASSWORD_VERSION_VALUE}')
@@ -1127,45 +1438,45 @@ def validate_user_dict(user_dict):
     # sanity check pwhash for user
     #
     if not user_dict['pwhash']:
-        ioccc_last_errmsg = "ERROR: in " + me + ": missing pwhash for username : <<" + \
-                            username + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": missing pwhash for username : <<" + \
+                            username + ">>")
         error(f'{me}: missing pwhash for username: {username}')
         return False
     if not isinstance(user_dict['pwhash'], str):
-        ioccc_last_errmsg = "ERROR: in " + me + ": pwhash is not a string for username : <<" + \
-                            username + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": pwhash is not a string for username : <<" + \
+                            username + ">>")
         error(f'{me}: pwhash not a string for username: {username}')
         return False
 
     # sanity check admin for user
     #
     if not isinstance(user_dict['admin'], bool):
-        ioccc_last_errmsg = "ERROR: in " + me + ": admin is not a boolean for username : <<" + \
-                            username + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": admin is not a boolean for username : <<" + \
+                            username + ">>")
         error(f'{me}: admin not a boolean for username: {username}')
         return False
 
     # sanity check force_pw_change for user
     #
     if not isinstance(user_dict['force_pw_change'], bool):
-        ioccc_last_errmsg = "ERROR: in " + me + ": force_pw_change is not a boolean for username : <<" + \
-                            username + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": force_pw_change is not a boolean for username : <<" + \
+                            username + ">>")
         error(f'{me}: force_pw_change not a boolean for username: {username}')
         return False
 
     # sanity check pw_change_by for user
     #
     if user_dict['pw_change_by'] and not isinstance(user_dict['pw_change_by'], str):
-        ioccc_last_errmsg = "ERROR: in " + me + ": pw_change_by is not null nor string for username : <<" + \
-                            username + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": pw_change_by is not null nor string for username : <<" + \
+                            username + ">>")
         error(f'{me}: pw_change_by not null nor string for for username: {username}')
         return False
 
     # sanity check disable_login for user
     #
     if not isinstance(user_dict['disable_login'], bool):
-        ioccc_last_errmsg = "ERROR: in " + me + ": disable_login is not a boolean for username : <<" + \
-                            username + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": disable_login is not a boolean for username : <<" + \
+                            username + ">>")
         error(f'{me}: disable_login not a boolean for username: {username}')
         return False
 
@@ -1196,9 +1507,7 @@ def lookup_username(username):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
-    me = inspect.currentframe().f_code.co_name
+    me = "lookup_username"
     debug(f'{me}: start')
 
     # paranoia - username arg must be a string
@@ -1236,8 +1545,8 @@ def lookup_username(username):
     # This also prevents username with /, and prevents it from being empty string,
     # thus one cannot create a username with system cracking "funny business".
     #
-    if not re.match(POSIX_SAFE_RE, username):
-        ioccc_last_errmsg = "ERROR: in " + me + ": username arg not POSIX safe"
+    if not POSIX_SAFE_PAT.fullmatch(username):
+        ioccc_last_errmsg.set("ERROR: in " + me + ": username arg not POSIX safe")
         info(f'{me}: username arg not POSIX safe')
         return None
 
@@ -1256,7 +1565,7 @@ def lookup_username(username):
             user_dict = i
             break
     if not user_dict:
-        ioccc_last_errmsg = "ERROR: in " + me + ": unknown username: <<" + username + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": unknown username: <<" + username + ">>")
         debug(f'{me}: failed to find in password file for username: {username}')
         return None
 
@@ -1301,29 +1610,27 @@ def update_username(username, pwhash, admin, force_pw_change, pw_change_by, disa
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
     me = inspect.currentframe().f_code.co_name
     debug(f'{me}: start')
 
     # paranoia - username arg must be a string
     #
     if not isinstance(username, str):
-        ioccc_last_errmsg = f'{me}: username arg is not a string'
+        ioccc_last_errmsg.set(f'{me}: username arg is not a string')
         info(f'{me}: username arg is not a string')
         return None
 
     # paranoia - username cannot be too short
     #
     if len(username) < MIN_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         info(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         return None
 
     # paranoia - username cannot be too long
     #
     if len(username) > MAX_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         info(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         return None
 
@@ -1332,48 +1639,48 @@ def update_username(username, pwhash, admin, force_pw_change, pw_change_by, disa
     # This also prevents username with /, and prevents it from being empty string,
     # thus one cannot create a username with system cracking "funny business".
     #
-    if not re.match(POSIX_SAFE_RE, username):
-        ioccc_last_errmsg = "ERROR: in " + me + ": username arg not POSIX safe"
+    if not POSIX_SAFE_PAT.fullmatch(username):
+        ioccc_last_errmsg.set("ERROR: in " + me + ": username arg not POSIX safe")
         info(f'{me}: username arg not POSIX safe')
         return None
 
     # paranoia - pwhash must be a string
     #
     if not isinstance(pwhash, str):
-        ioccc_last_errmsg = "ERROR: in " + me + \
-                        ": pwhash arg is not a string for username : <<" + username + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + \
+                        ": pwhash arg is not a string for username : <<" + username + ">>")
         error(f'{me}: pwhash arg is not a string')
         return False
 
     # paranoia - admin must be a boolean
     #
     if not isinstance(admin, bool):
-        ioccc_last_errmsg = "ERROR: in " + me + \
-                        ": admin arg is not a boolean for username : <<" + username + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + \
+                        ": admin arg is not a boolean for username : <<" + username + ">>")
         error(f'{me}: admin arg is not a boolean')
         return False
 
     # paranoia - force_pw_change must be a boolean
     #
     if not isinstance(force_pw_change, bool):
-        ioccc_last_errmsg = "ERROR: in " + me + \
-                        ": force_pw_change arg is not a boolean for username : <<" + username + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + \
+                        ": force_pw_change arg is not a boolean for username : <<" + username + ">>")
         error(f'{me}: force_pw_change arg is not a boolean')
         return False
 
     # paranoia - pw_change_by must None or must be be string
     #
     if not isinstance(pw_change_by, str) and pw_change_by is not None:
-        ioccc_last_errmsg = "ERROR: in " + me + \
-                        ": pw_change_by arg is not a string nor None for username : <<" + username + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + \
+                        ": pw_change_by arg is not a string nor None for username : <<" + username + ">>")
         error(f'{me}: pw_change_by arg is not a string')
         return False
 
     # paranoia - disable_login must be a boolean
     #
     if not isinstance(disable_login, bool):
-        ioccc_last_errmsg = "ERROR: in " + me + \
-                        ": disable_login arg is not a boolean for username : <<" + username + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + \
+                        ": disable_login arg is not a boolean for username : <<" + username + ">>")
         error(f'{me}: disable_login arg is not a boolean')
         return False
 
@@ -1390,8 +1697,8 @@ def update_username(username, pwhash, admin, force_pw_change, pw_change_by, disa
         try:
             shutil.copy2(INIT_PW_FILE, PW_FILE, follow_symlinks=True)
         except OSError as errcode:
-            ioccc_last_errmsg = "ERROR: in " + me + " #1: cannot cp -p " + INIT_PW_FILE + \
-                            " " + PW_FILE + " exception: " + str(errcode)
+            ioccc_last_errmsg.set("ERROR: in " + me + " #1: cannot cp -p " + INIT_PW_FILE + \
+                            " " + PW_FILE + " exception: " + str(errcode))
             error(f'{me}: cp -p {INIT_PW_FILE} {PW_FILE} failed: <<{str(errcode)}>>')
             ioccc_file_unlock()
             return False
@@ -1399,11 +1706,11 @@ def update_username(username, pwhash, admin, force_pw_change, pw_change_by, disa
     # load the password file and unlock
     #
     try:
-        with open(PW_FILE, 'r', encoding="utf-8") as j_pw:
+        with open(PW_FILE, 'rb') as j_pw:
 
             # read the JSON of the password file
             #
-            pw_file_json = json.load(j_pw)
+            pw_file_json = ioccc_json_loads(j_pw.read())
 
             # firewall
             #
@@ -1411,8 +1718,8 @@ def update_username(username, pwhash, admin, force_pw_change, pw_change_by, disa
 
                 # we have no JSON to return
                 #
-                ioccc_last_errmsg = "ERROR: in " + me + ": failed to read " + PW_FILE + \
-                                    " exception: " + str(errcode)
+                ioccc_last_errmsg.set("ERROR: in " + me + ": failed to read " + PW_FILE + \
+                                    " exception: " + str(errcode))
                 error(f'{me}: read {PW_FILE} failed: <<{str(errcode)}>>')
                 ioccc_file_unlock()
                 return False
@@ -1421,8 +1728,8 @@ def update_username(username, pwhash, admin, force_pw_change, pw_change_by, disa
 
         # unlock the password file
         #
-        ioccc_last_errmsg = "ERROR: in " + me + ": cannot read password file" + \
-                        " exception: " + str(errcode)
+        ioccc_last_errmsg.set("ERROR: in " + me + ": cannot read password file" + \
+                        " exception: " + str(errcode))
         error(f'{me}: open for reading {PW_FILE} failed: <<{str(errcode)}>>')
         ioccc_file_unlock()
         return False
@@ -1460,34 +1767,8 @@ def update_username(username, pwhash, admin, force_pw_change, pw_change_by, disa
 
     # rewrite the password file with the pw_file_json and unlock
     #
-    try:
-        with open(PW_FILE, mode="w", encoding="utf-8") as j_pw:
-            j_pw.write(json.dumps(pw_file_json, ensure_ascii=True, indent=4))
-            j_pw.write('\n')
-
-            # close and unlock the password file
-            #
-            # NOTE: We explicitly manage the close because we just did a write
-            #       and we want to catch the case where a write buffer may have
-            #       not been fully flushed to the file.
-            #
-            try:
-                j_pw.close()
-
-            except OSError as errcode:
-                ioccc_last_errmsg = "ERROR: in " + me + ": failed to close: " + PW_FILE + \
-                                    " exception: " + str(errcode)
-                error(f'{me}: close for writing {PW_FILE} failed: <<{str(errcode)}>>')
-                ioccc_file_unlock()
-                return False
-
-    except OSError as errcode:
-        ioccc_last_errmsg = "ERROR: in " + me + ": unable to write password file" + \
-                        " exception: " + str(errcode)
-        error(f'{me}: open for writing {PW_FILE} failed: <<{str(errcode)}>>')
-
-        # unlock the password file
-        #
+    if not write_json_file(PW_FILE, pw_file_json):
+        error(f'{me}: write_json_file failed for PW_FILE: {PW_FILE}')
         ioccc_file_unlock()
         return False
 
@@ -1504,10 +1785,6 @@ def update_username(username, pwhash, admin, force_pw_change, pw_change_by, disa
 # pylint: enable=too-many-arguments
 
 
-# pylint: disable=too-many-return-statements
-# pylint: disable=too-many-statements
-# pylint: disable=too-many-branches
-#
 def delete_username(username):
     """
     Remove a username from the password file
@@ -1524,42 +1801,90 @@ def delete_username(username):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
     me = inspect.currentframe().f_code.co_name
     debug(f'{me}: start')
 
-    # paranoia - username arg must be a string
+    # remove the user
     #
-    if not isinstance(username, str):
-        ioccc_last_errmsg = f'{me}: username arg is not a string'
-        info(f'{me}: username arg is not a string')
+    deleted_users = delete_usernames([username])
+    if not deleted_users:
         return None
 
-    # paranoia - username cannot be too short
+    # return the user that was deleted
     #
-    if len(username) < MIN_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}'
-        info(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
-        return None
+    return deleted_users[0]
 
-    # paranoia - username cannot be too long
-    #
-    if len(username) > MAX_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}'
-        info(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
-        return None
 
-    # paranoia - username must be a POSIX safe filename string
+# pylint: disable=too-many-return-statements
+# pylint: disable=too-many-statements
+# pylint: disable=too-many-branches
+#
+def delete_usernames(usernames):
+    """
+    Remove a list of usernames from the password file
+
+    The password file is read once and rewritten once, regardless of
+    how many usernames are removed.
+
+    Given:
+        usernames   list of IOCCC submit server usernames to remove
+
+    Returns:
+        None ==> usernames is not a list, or
+                 a username does not match POSIX_SAFE_RE, or
+                 bad password file
+        != None ==> list of removed user information as python dictionaries,
+                    empty if none of the usernames were found
+    """
+
+    # setup
     #
-    # This also prevents username with /, and prevents it from being empty string,
-    # thus one cannot create a username with system cracking "funny business".
+    me = inspect.currentframe().f_code.co_name
+    debug(f'{me}: start')
+
+    # paranoia - usernames arg must be a list
     #
-    if not re.match(POSIX_SAFE_RE, username):
-        ioccc_last_errmsg = "ERROR: in " + me + ": username arg not POSIX safe"
-        info(f'{me}: username arg not POSIX safe')
+    if not isinstance(usernames, list):
+        ioccc_last_errmsg.set(f'{me}: usernames arg is not a list')
+        info(f'{me}: usernames arg is not a list')
         return None
 
+    # sanity check each username
+    #
+    for username in usernames:
+
+        # paranoia - username arg must be a string
+        #
+        if not isinstance(username, str):
+            ioccc_last_errmsg.set(f'{me}: username arg is not a string')
+            info(f'{me}: username arg is not a string')
+            return None
+
+        # paranoia - username cannot be too short
+        #
+        if len(username) < MIN_USERNAME_LENGTH:
+            ioccc_last_errmsg.set(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
+            info(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
+            return None
+
+        # paranoia - username cannot be too long
+        #
+        if len(username) > MAX_USERNAME_LENGTH:
+            ioccc_last_errmsg.set(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
+            info(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
+            return None
+
+        # paranoia - username must be a POSIX safe filename string
+        #
+        # This also prevents username with /, and prevents it from being empty string,
+        # thus one cannot create a username with system cracking "funny business".
+        #
+        if not POSIX_SAFE_PAT.fullmatch(username):
+            ioccc_last_errmsg.set("ERROR: in " + me + ": username arg not POSIX safe")
+            info(f'{me}: username arg not POSIX safe')
+            return None
+    delete_set = set(usernames)
+
     # Lock the password file
     #
     pw_lock_fd = ioccc_file_lock(PW_LOCK)
@@ -1573,53 +1898,52 @@ def delete_username(username):
         try:
             shutil.copy2(INIT_PW_FILE, PW_FILE, follow_symlinks=True)
         except OSError as errcode:
-            ioccc_last_errmsg = "ERROR: in " + me + " #2: cannot cp -p " + INIT_PW_FILE + \
-                            " " + PW_FILE + " exception: " + str(errcode)
+            ioccc_last_errmsg.set("ERROR: in " + me + " #2: cannot cp -p " + INIT_PW_FILE + \
+                            " " + PW_FILE + " exception: " + str(errcode))
             error(f'{me}: cp -p {INIT_PW_FILE} {PW_FILE} failed: <<{str(errcode)}>>')
             ioccc_file_unlock()
             return None
 
-    # load the password file and unlock
+    # load the password file
     #
     try:
-        with open(PW_FILE, 'r', encoding="utf-8") as j_pw:
+        with open(PW_FILE, 'rb') as j_pw:
 
             # read the JSON of the password file
             #
-            pw_file_json = json.load(j_pw)
-
-            # firewall
-            #
-            if not pw_file_json:
-
-                # we have no JSON to return
-                #
-                ioccc_last_errmsg = "ERROR: in " + me + ": failed to read " + PW_FILE + \
-                                    " exception: " + str(errcode)
-                error(f'{me}: read {PW_FILE} failed: <<{str(errcode)}>>')
-                ioccc_file_unlock()
-                return None
+            pw_file_json = ioccc_json_loads(j_pw.read())
 
     except OSError as errcode:
 
         # unlock the password file
         #
-        ioccc_last_errmsg = "ERROR: in " + me + ": cannot read password file" + \
-                        " exception: " + str(errcode)
+        ioccc_last_errmsg.set("ERROR: in " + me + ": cannot read password file" + \
+                        " exception: " + str(errcode))
         error(f'{me}: open for reading {PW_FILE} failed: <<{str(errcode)}>>')
         ioccc_file_unlock()
         return None
 
-    # scan through the password file, looking for the user
+    # firewall
+    #
+    if not pw_file_json:
+
+        # we have no JSON to return
+        #
+        ioccc_last_errmsg.set("ERROR: in " + me + ": failed to read " + PW_FILE)
+        error(f'{me}: read {PW_FILE} failed')
+        ioccc_file_unlock()
+        return None
+
+    # scan through the password file, looking for the users
     #
-    deleted_user = None
+    deleted_users = []
     new_pw_file_json = []
     for i in pw_file_json:
 
-        # set aside the username we are deleting
+        # set aside the usernames we are deleting
         #
-        if i['username'] == username:
-            deleted_user = i
+        if i['username'] in delete_set:
+            deleted_users.append(i)
 
         # otherwise save other users
         #
@@ -1628,47 +1952,100 @@ def delete_username(username):
 
     # rewrite the password file with the pw_file_json and unlock
     #
-    try:
-        with open(PW_FILE, mode="w", encoding="utf-8") as j_pw:
-            j_pw.write(json.dumps(new_pw_file_json, ensure_ascii=True, indent=4))
-            j_pw.write('\n')
-
-            # close and unlock the password file
-            #
-            # NOTE: We explicitly manage the close because we just did a write
-            #       and we want to catch the case where a write buffer may have
-            #       not been fully flushed to the file.
-            #
-            try:
-                j_pw.close()
-
-            except OSError as errcode:
-                ioccc_last_errmsg = "ERROR: in " + me + ": failed to close: " + PW_FILE + \
-                                    " exception: " + str(errcode)
-                error(f'{me}: close for writing {PW_FILE} failed: <<{str(errcode)}>>')
-                ioccc_file_unlock()
-                return None
-
-    except OSError as errcode:
-
-        # unlock the password file
-        #
-        ioccc_last_errmsg = "ERROR: in " + me + ": unable to write password file" + \
-                        " exception: " + str(errcode)
-        error(f'{me}: open for writing {PW_FILE} failed: <<{str(errcode)}>>')
+    if not write_json_file(PW_FILE, new_pw_file_json):
+        error(f'{me}: write_json_file failed for PW_FILE: {PW_FILE}')
         ioccc_file_unlock()
         return None
 
-    # return the user that was deleted, if they were found
+    # return the users that were deleted, if they were found
     #
     ioccc_file_unlock()
-    return deleted_user
+    return deleted_users
 #
 # pylint: enable=too-many-return-statements
 # pylint: enable=too-many-statements
 # pylint: enable=too-many-branches
 
 
+# pylint: disable=too-many-return-statements
+#
+def username_exists(username):
+    """
+    Determine if a username is in the password file
+
+    Answer via a set of the usernames in the password file.  The set is formed
+    again only when load_pwfile() returns new password file contents.
+
+    Given:
+        username    IOCCC submit server username
+
+    Returns:
+        True ==> username is in the password file
+        False ==> no such username, or
+                  username does not match POSIX_SAFE_RE, or
+                  bad password file
+    """
+
+    # setup
+    #
+    # pylint: disable-next=global-statement
+    global ioccc_pw_usernames
+    me = "username_exists"
+    debug(f'{me}: start')
+
+    # paranoia - username arg must be a string
+    #
+    if not isinstance(username, str):
+        info(f'{me}: username arg is not a string')
+        return False
+
+    # paranoia - username cannot be too short
+    #
+    if len(username) < MIN_USERNAME_LENGTH:
+        info(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
+        return False
+
+    # paranoia - username cannot be too long
+    #
+    if len(username) > MAX_USERNAME_LENGTH:
+        info(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
+        return False
+
+    # paranoia - username must be a POSIX safe filename string
+    #
+    # This also prevents username with /, and prevents it from being empty string,
+    # thus one cannot create a username with system cracking "funny business".
+    #
+    if not POSIX_SAFE_PAT.fullmatch(username):
+        ioccc_last_errmsg.set("ERROR: in " + me + ": username arg not POSIX safe")
+        info(f'{me}: username arg not POSIX safe')
+        return False
+
+    # load the password file
+    #
+    pw_file_json = load_pwfile()
+    if not pw_file_json:
+        error(f'{me}: load_pwfile failed for username: {username}')
+        return False
+
+    # form the set of usernames if the password file has changed
+    #
+    usernames = ioccc_pw_usernames
+    if not usernames or usernames[0] is not pw_file_json:
+        usernames = (pw_file_json, frozenset(i.get('username') for i in pw_file_json if isinstance(i, dict)))
+        ioccc_pw_usernames = usernames
+
+    # report if the username was found
+    #
+    if username not in usernames[1]:
+        ioccc_last_errmsg.set("ERROR: in " + me + ": unknown username: <<" + username + ">>")
+        debug(f'{me}: failed to find in password file for username: {username}')
+        return False
+    return True
+#
+# pylint: enable=too-many-return-statements
+
+
 def generate_password():
     """
     Generate a random password.
@@ -1681,8 +2058,6 @@ def generate_password():
     #
     # pylint: disable-next=global-statement
     global ioccc_pw_words
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
     me = inspect.currentframe().f_code.co_name
     debug(f'{me}: start')
     blacklist = set('`"\\')
@@ -1698,8 +2073,8 @@ def generate_password():
                     ioccc_pw_words = [word.strip() for word in f]
 
                 except OSError as errcode:
-                    ioccc_last_errmsg = "ERROR: in " + me + ": failed to read: " + PW_WORDS + \
-                                        " exception: " + str(errcode)
+                    ioccc_last_errmsg.set("ERROR: in " + me + ": failed to read: " + PW_WORDS + \
+                                        " exception: " + str(errcode))
                     error(f'{me}: reading {PW_WORDS} failed: <<{str(errcode)}>>')
 
                     # generate a random password string based on UUID, a "++" and a f9.4 number
@@ -1710,8 +2085,8 @@ def generate_password():
                     return password
 
         except OSError as errcode:
-            ioccc_last_errmsg = "ERROR: in " + me + ": failed to open: " + PW_WORDS + \
-                                " exception: " + str(errcode)
+            ioccc_last_errmsg.set("ERROR: in " + me + ": failed to open: " + PW_WORDS + \
+                                " exception: " + str(errcode))
             error(f'{me}: open for reading {PW_WORDS} failed: <<{str(errcode)}>>')
 
             # generate a random password string based on UUID, a "**" and a f9.4 number
@@ -1822,15 +2197,13 @@ def hash_password(password):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
     me = inspect.currentframe().f_code.co_name
     debug(f'{me}: start')
 
     # firewall - password must be a string
     #
     if not isinstance(password, str):
-        ioccc_last_errmsg = "ERROR: in " + me + ": password arg is not a string"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": password arg is not a string")
         error(f'{me}: password arg is not a string')
         return None
 
@@ -1853,22 +2226,20 @@ def verify_hashed_password(password, pwhash):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
-    me = inspect.currentframe().f_code.co_name
+    me = "verify_hashed_password"
     debug(f'{me}: start')
 
     # firewall - password must be a string
     #
     if not isinstance(password, str):
-        ioccc_last_errmsg = "ERROR: in " + me + ": password arg is not a string"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": password arg is not a string")
         error(f'{me}: password arg is not a string')
         return False
 
     # firewall - pwhash must be a string
     #
     if not isinstance(pwhash, str):
-        ioccc_last_errmsg = "ERROR: in " + me + ": pwhash arg is not a string"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": pwhash arg is not a string")
         error(f'{me}: pwhash arg is not a string')
         return False
 
@@ -1877,6 +2248,32 @@ def verify_hashed_password(password, pwhash):
     return check_password_hash(pwhash, password)
 
 
+@lru_cache(maxsize=1)
+def return_dummy_pwhash():
+    """
+    Return the hash of a random password that no user has
+
+    When a username is not found, the password is checked against this hash
+    anyway, so that rejecting an unknown username costs about the same time as
+    rejecting a known username with a wrong password.  This denies a system cracker
+    a timing oracle for which usernames exist.
+
+    Returns:
+        hashed password string
+
+    NOTE: This function is cached, so the hash is computed once per process.
+    """
+
+    # setup
+    #
+    me = inspect.currentframe().f_code.co_name
+    debug(f'{me}: start')
+
+    # hash a random password that is never given to anyone
+    #
+    return generate_password_hash(secrets.token_hex(32))
+
+
 # pylint: disable=too-many-return-statements
 #
 def verify_user_password(username, password):
@@ -1897,29 +2294,27 @@ def verify_user_password(username, password):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
-    me = inspect.currentframe().f_code.co_name
+    me = "verify_user_password"
     debug(f'{me}: start')
 
     # paranoia - username arg must be a string
     #
     if not isinstance(username, str):
-        ioccc_last_errmsg = f'{me}: username arg is not a string'
+        ioccc_last_errmsg.set(f'{me}: username arg is not a string')
         info(f'{me}: username arg is not a string')
         return None
 
     # paranoia - username cannot be too short
     #
     if len(username) < MIN_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         info(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         return None
 
     # paranoia - username cannot be too long
     #
     if len(username) > MAX_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         info(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         return None
 
@@ -1928,15 +2323,15 @@ def verify_user_password(username, password):
     # This also prevents username with /, and prevents it from being empty string,
     # thus one cannot create a username with system cracking "funny business".
     #
-    if not re.match(POSIX_SAFE_RE, username):
-        ioccc_last_errmsg = "ERROR: in " + me + ": username arg not POSIX safe"
+    if not POSIX_SAFE_PAT.fullmatch(username):
+        ioccc_last_errmsg.set("ERROR: in " + me + ": username arg not POSIX safe")
         info(f'{me}: username arg not POSIX safe')
         return None
 
     # firewall - password must be a string
     #
     if not isinstance(password, str):
-        ioccc_last_errmsg = "ERROR: in " + me + ": password arg is not a string"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": password arg is not a string")
         error(f'{me}: password arg is not a string')
         return False
 
@@ -1947,7 +2342,11 @@ def verify_user_password(username, password):
 
         # user is not in the password file, so we cannot state they have been disabled
         #
+        # NOTE: We check the password against a dummy hash so that an unknown username
+        #       takes about as long to reject as a wrong password.
+        #
         debug(f'{me}: lookup_username failed for username: {username}')
+        verify_hashed_password(password, return_dummy_pwhash())
         return False
 
     # fail if the user is not allowed to login
@@ -2044,15 +2443,13 @@ def is_pw_pwned(password):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
     me = inspect.currentframe().f_code.co_name
     debug(f'{me}: start')
 
     # firewall - password must be a string
     #
     if not isinstance(password, str):
-        ioccc_last_errmsg = "ERROR: in " + me + ": password arg is not a string"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": password arg is not a string")
         error(f'{me}: password arg is not a string')
         return True
 
@@ -2060,13 +2457,13 @@ def is_pw_pwned(password):
     #
     m = hashlib.sha1()
     if not m:
-        ioccc_last_errmsg = "ERROR: in " + me + ": unable to form a context for SHA-1 hashing"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": unable to form a context for SHA-1 hashing")
         error(f'{me}: unable to form a context for SHA-1 hashing')
         return True
     m.update(bytes(password, 'utf-8'))
     sha1_hex = m.hexdigest().upper()
     if not sha1_hex or len(sha1_hex) != SHA1_HEXLEN:
-        ioccc_last_errmsg = "ERROR: in " + me + ": SHA-1 hash return was invalid"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": SHA-1 hash return was invalid")
         error(f'{me}: invalid SHA-1 hash return')
         return True
 
@@ -2099,8 +2496,8 @@ def is_pw_pwned(password):
                     return True
 
     except OSError as errcode:
-        ioccc_last_errmsg = "ERROR: in " + me + ": failed using: " + pwned_file + \
-                            " exception: " + str(errcode)
+        ioccc_last_errmsg.set("ERROR: in " + me + ": failed using: " + pwned_file + \
+                            " exception: " + str(errcode))
         error(f'{me}: failed open for reading: {pwned_file}')
         return True
 
@@ -2133,38 +2530,37 @@ def is_proper_password(password):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
     me = inspect.currentframe().f_code.co_name
     debug(f'{me}: start')
 
     # firewall - password must be a string
     #
     if not isinstance(password, str):
-        ioccc_last_errmsg = "ERROR: in " + me + ": password arg is not a string"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": password arg is not a string")
         error(f'{me}: password arg is not a string')
         return False
 
     # password must be at at least MIN_PASSWORD_LENGTH long
     #
     if len(password) < MIN_PASSWORD_LENGTH:
-        ioccc_last_errmsg = "ERROR: password must be at least " + str(MIN_PASSWORD_LENGTH) + \
-                      " characters long"
+        ioccc_last_errmsg.set("ERROR: password must be at least " + str(MIN_PASSWORD_LENGTH) + \
+                      " characters long")
         debug(f'{me}: password is too short')
         return False
 
     # password must be a sane length
     #
     if len(password) > MAX_PASSWORD_LENGTH:
-        ioccc_last_errmsg = "ERROR: password must not be longer than " + str(MAX_PASSWORD_LENGTH) + \
-                      " characters"
+        ioccc_last_errmsg.set("ERROR: password must not be longer than " + str(MAX_PASSWORD_LENGTH) + \
+                      " characters")
         debug(f'{me}: password is too long')
         return False
 
     # password must not have been Pwned
     #
     if is_pw_pwned(password):
-        ioccc_last_errmsg = "ERROR: new password has been Pwned (compromised), please select a different new password"
+        ioccc_last_errmsg.set("ERROR: new password has been Pwned (compromised), "
+                              "please select a different new password")
         debug(f'{me}: is_pw_pwned returned true for a password')
         return False
 
@@ -2200,29 +2596,27 @@ def update_password(username, old_password, new_password):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
     me = inspect.currentframe().f_code.co_name
     debug(f'{me}: start')
 
     # paranoia - username arg must be a string
     #
     if not isinstance(username, str):
-        ioccc_last_errmsg = f'{me}: username arg is not a string'
+        ioccc_last_errmsg.set(f'{me}: username arg is not a string')
         info(f'{me}: username arg is not a string')
         return False
 
     # paranoia - username cannot be too short
     #
     if len(username) < MIN_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         info(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         return False
 
     # paranoia - username cannot be too long
     #
     if len(username) > MAX_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         info(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         return False
 
@@ -2231,22 +2625,22 @@ def update_password(username, old_password, new_password):
     # This also prevents username with /, and prevents it from being empty string,
     # thus one cannot create a username with system cracking "funny business".
     #
-    if not re.match(POSIX_SAFE_RE, username):
-        ioccc_last_errmsg = "ERROR: in " + me + ": username arg not POSIX safe"
+    if not POSIX_SAFE_PAT.fullmatch(username):
+        ioccc_last_errmsg.set("ERROR: in " + me + ": username arg not POSIX safe")
         info(f'{me}: username arg not POSIX safe')
         return False
 
     # firewall - old_password must be a string
     #
     if not isinstance(old_password, str):
-        ioccc_last_errmsg = "ERROR: in " + me + ": old_password arg is not a string"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": old_password arg is not a string")
         error(f'{me}: old_password arg is not a string')
         return False
 
     # firewall - new_password must be a string
     #
     if not isinstance(new_password, str):
-        ioccc_last_errmsg = "ERROR: in " + me + ": new_password arg is not a string"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": new_password arg is not a string")
         error(f'{me}: new_password arg is not a string')
         return False
 
@@ -2281,7 +2675,7 @@ def update_password(username, old_password, new_password):
 
         # old_password is not correct
         #
-        ioccc_last_errmsg = "ERROR: invalid old password"
+        ioccc_last_errmsg.set("ERROR: invalid old password")
         info(f'{me}: old_password is not correct for username: {username}')
         return False
 
@@ -2325,9 +2719,7 @@ def user_allowed_to_login(user_dict):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
-    me = inspect.currentframe().f_code.co_name
+    me = "user_allowed_to_login"
     debug(f'{me}: start')
 
     # sanity check the user information
@@ -2343,21 +2735,21 @@ def user_allowed_to_login(user_dict):
     # paranoia - username value is not a string
     #
     if not isinstance(username, str):
-        ioccc_last_errmsg = f'{me}: username value is not a string'
+        ioccc_last_errmsg.set(f'{me}: username value is not a string')
         info(f'{me}: username arg is not a string')
         return False
 
     # paranoia - username cannot be too short
     #
     if len(username) < MIN_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username value is too short: {len(username)} < {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username value is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         info(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         return False
 
     # paranoia - username cannot be too long
     #
     if len(username) > MAX_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username value is too long: {len(username)} > {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username value is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         info(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         return False
 
@@ -2366,8 +2758,8 @@ def user_allowed_to_login(user_dict):
     # This also prevents username with /, and prevents it from being empty string,
     # thus one cannot create a username with system cracking "funny business".
     #
-    if not re.match(POSIX_SAFE_RE, username):
-        ioccc_last_errmsg = "ERROR: in " + me + ": username value not POSIX safe"
+    if not POSIX_SAFE_PAT.fullmatch(username):
+        ioccc_last_errmsg.set("ERROR: in " + me + ": username value not POSIX safe")
         info(f'{me}: username arg not POSIX safe')
         return False
 
@@ -2377,7 +2769,7 @@ def user_allowed_to_login(user_dict):
 
         # login disabled
         #
-        ioccc_last_errmsg = "ERROR: user login has been disabled"
+        ioccc_last_errmsg.set("ERROR: user login has been disabled")
         info(f'{me}: login not allowed for username: {username}')
         return False
 
@@ -2390,8 +2782,8 @@ def user_allowed_to_login(user_dict):
         try:
             pw_change_by = datetime.strptime(user_dict["pw_change_by"], DATETIME_FORMAT)
         except ValueError as errcode:
-            ioccc_last_errmsg = "ERROR: in " + me + ": not in datetime format: <<" + \
-                      user_dict['pw_change_by'] + ">> exception: <<" + str(errcode) + ">>"
+            ioccc_last_errmsg.set("ERROR: in " + me + ": not in datetime format: <<" + \
+                      user_dict['pw_change_by'] + ">> exception: <<" + str(errcode) + ">>")
             error(f'{me}: datetime.strptime of pw_change_by: {user_dict["pw_change_by"]} '
                   f'failed: <<{str(errcode)}>>')
             return False
@@ -2403,7 +2795,7 @@ def user_allowed_to_login(user_dict):
         # failed to change the password in time
         #
         if now > pw_change_by:
-            ioccc_last_errmsg = "ERROR: user failed to change the password in time"
+            ioccc_last_errmsg.set("ERROR: user failed to change the password in time")
             info(f'{me}: password not changed in time for username: {username}')
             return False
 
@@ -2459,29 +2851,27 @@ def username_login_allowed(username):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
     me = inspect.currentframe().f_code.co_name
     debug(f'{me}: start')
 
     # paranoia - username arg must be a string
     #
     if not isinstance(username, str):
-        ioccc_last_errmsg = f'{me}: username arg is not a string'
+        ioccc_last_errmsg.set(f'{me}: username arg is not a string')
         info(f'{me}: username arg is not a string')
         return False
 
     # paranoia - username cannot be too short
     #
     if len(username) < MIN_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         info(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         return False
 
     # paranoia - username cannot be too long
     #
     if len(username) > MAX_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         info(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         return False
 
@@ -2490,8 +2880,8 @@ def username_login_allowed(username):
     # This also prevents username with /, and prevents it from being empty string,
     # thus one cannot create a username with system cracking "funny business".
     #
-    if not re.match(POSIX_SAFE_RE, username):
-        ioccc_last_errmsg = "ERROR: in " + me + ": username arg not POSIX safe"
+    if not POSIX_SAFE_PAT.fullmatch(username):
+        ioccc_last_errmsg.set("ERROR: in " + me + ": username arg not POSIX safe")
         info(f'{me}: username arg not POSIX safe')
         return False
 
@@ -2534,30 +2924,27 @@ def lock_slot(username, slot_num):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
     me = inspect.currentframe().f_code.co_name
     debug(f'{me}: start')
-    umask(0o022)
 
     # paranoia - username arg must be a string
     #
     if not isinstance(username, str):
-        ioccc_last_errmsg = f'{me}: username arg is not a string'
+        ioccc_last_errmsg.set(f'{me}: username arg is not a string')
         info(f'{me}: username arg is not a string')
         return None
 
     # paranoia - username cannot be too short
     #
     if len(username) < MIN_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         info(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         return None
 
     # paranoia - username cannot be too long
     #
     if len(username) > MAX_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         info(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         return None
 
@@ -2566,8 +2953,8 @@ def lock_slot(username, slot_num):
     # This also prevents username with /, and prevents it from being empty string,
     # thus one cannot create a username with system cracking "funny business".
     #
-    if not re.match(POSIX_SAFE_RE, username):
-        ioccc_last_errmsg = "ERROR: in " + me + ": username arg not POSIX safe"
+    if not POSIX_SAFE_PAT.fullmatch(username):
+        ioccc_last_errmsg.set("ERROR: in " + me + ": username arg not POSIX safe")
         info(f'{me}: username arg not POSIX safe')
         return None
 
@@ -2592,26 +2979,33 @@ def lock_slot(username, slot_num):
         error(f'{me}: return_slot_dir_path failed for username: {username} slot_num: {slot_num}')
         return None
 
-    # be sure the user directory exists
+    # be sure the user and slot directories exist
     #
-    try:
-        makedirs(user_dir, mode=0o2770, exist_ok=True)
-    except OSError as errcode:
-        ioccc_last_errmsg = "ERROR: in " + me + ": failed to create for username: <<" + username + ">>"
-        error(f'{me}: mkdir for username: {username} failed: <<{str(errcode)}>>')
-        return None
-
-    # be sure the slot directory exits
+    # Once this process has formed the user directory tree, we do not need to
+    # try to form the user and slot directories again.
     #
-    try:
-        makedirs(slot_dir, mode=0o2770, exist_ok=True)
+    if username not in ioccc_user_dirs_ready:
 
-    except OSError as errcode:
-        ioccc_last_errmsg = "ERROR: in " + me + ": failed to create slot: " + slot_num_str + \
-                        "for username: <<" + username + ">>" + " exception: " + str(errcode)
-        error(f'{me}: slot directory mkdir for username: {username} slot_num: {slot_num} '
-              f'failed: <<{str(errcode)}>>')
-        return None
+        # be sure the user directory exists
+        #
+        try:
+            makedirs(user_dir, mode=0o2770, exist_ok=True)
+        except OSError as errcode:
+            ioccc_last_errmsg.set("ERROR: in " + me + ": failed to create for username: <<" + username + ">>")
+            error(f'{me}: mkdir for username: {username} failed: <<{str(errcode)}>>')
+            return None
+
+        # be sure the slot directory exits
+        #
+        try:
+            makedirs(slot_dir, mode=0o2770, exist_ok=True)
+
+        except OSError as errcode:
+            ioccc_last_errmsg.set("ERROR: in " + me + ": failed to create slot: " + slot_num_str + \
+                            "for username: <<" + username + ">>" + " exception: " + str(errcode))
+            error(f'{me}: slot directory mkdir for username: {username} slot_num: {slot_num} '
+                  f'failed: <<{str(errcode)}>>')
+            return None
 
     # determine the lock filename
     #
@@ -2624,8 +3018,12 @@ def lock_slot(username, slot_num):
     # case: filed to lock
     #
     if not slot_lock_fd:
-        ioccc_last_errmsg = "ERROR: in " + me + ": failed to lock: " + slot_file_lock
+        ioccc_last_errmsg.set("ERROR: in " + me + ": failed to lock: " + slot_file_lock)
         error(f'{me}: failed to lock file for slot_file_lock: {slot_file_lock}')
+
+        # the directory tree may have been removed, so form it again next time
+        #
+        ioccc_user_dirs_ready.discard(username)
         return None
 
     # return the slot lock success or None
@@ -2669,96 +3067,207 @@ def write_slot_json(slot_json_file, slot_json):
     Returns:
         True    slot JSON file updated
         False   failed to update slot JSON file
+
+    NOTE: On success, slot_json is cached as the contents of slot_json_file.
+          The caller must NOT modify slot_json after this call.
     """
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
     me = inspect.currentframe().f_code.co_name
     debug(f'{me}: start')
 
     # write JSON file for slot
     #
-    try:
-        with open(slot_json_file, mode="w", encoding="utf-8") as slot_file_fp:
-            slot_file_fp.write(json.dumps(slot_json, ensure_ascii=True, indent=4))
-            slot_file_fp.write('\n')
-
-            # close slot file
-            #
-            # NOTE: We explicitly manage the close because we just did a write
-            #       and we want to catch the case where a write buffer may have
-            #       not been fully flushed to the file.
-            #
-            try:
-                slot_file_fp.close()
-
-            except OSError as errcode:
-                ioccc_last_errmsg = "ERROR: in " + me + ": failed to close: " + slot_json_file + \
-                                    " exception: " + str(errcode)
-                error(f'{me}: close writing for slot_json_file: {slot_json_file} '
-                      f'failed: <<{str(errcode)}>>')
-                return False
+    if not write_json_file(slot_json_file, slot_json, compact=True):
+        error(f'{me}: write_json_file failed for slot_json_file: {slot_json_file}')
+        return False
 
+    # cache what we just wrote so that the slot JSON file need not be read again
+    #
+    try:
+        json_cache_store(slot_json_file, os.stat(slot_json_file), slot_json)
     except OSError as errcode:
-        ioccc_last_errmsg = "ERROR: failed to write out slot file: " + slot_json_file + \
-                            " exception: " + str(errcode)
-        error(f'{me}: open for slot_json_file: {slot_json_file} failed: <<{str(errcode)}>>')
-        return False
+        debug(f'{me}: stat of slot_json_file: {slot_json_file} failed: <<{str(errcode)}>>')
 
     return True
 
 
-# pylint: disable=too-many-statements
-# pylint: disable=too-many-branches
 # pylint: disable=too-many-return-statements
 #
-def initialize_user_tree(username):
+def validate_slot_dict(slot, username, slot_num):
     """
-    Initialize the directory tree for a given user
-
-    We create the directory for the username if the directory does not exist.
-    We create the slot for the username if the slot directory does not exist.
-    We create the lock file for the slot it the lock file does not exist.
-    We initialize the slot JSON file it the slot JSON file does not exist.
-
-    NOTE: Because this may be called early, we cannot use HTML or other
-          error carping delivery.  We only set last_excpt are return None.
+    Perform sanity checks on the JSON information of a user's slot
 
     Given:
+        slot        slot information as a python dictionary
         username    IOCCC submit server username
+        slot_num    slot number for a given username
 
     Returns:
-        None ==> invalid slot number or invalid user directory
-        != None ==> array of slot user data as a python dictionary
+        True ==> no error found with in slot information
+        False ==> a problem was found with slot JSON information
     """
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
-    me = inspect.currentframe().f_code.co_name
+    me = "validate_slot_dict"
     debug(f'{me}: start')
+    slot_num_str = str(slot_num)
 
-    # paranoia - username arg must be a string
+    # sanity check argument
+    #
+    if not isinstance(slot, dict):
+        ioccc_last_errmsg.set("ERROR: in " + me + ": slot is not a python dictionary for username : <<" + \
+                            username + ">> for slot: " + slot_num_str)
+        error(f'{me}: slot is not a python dictionary for username: {username} slot_num: {slot_num}')
+        return False
+
+    # sanity check slot no_comment
+    #
+    if not slot.get("no_comment"):
+        ioccc_last_errmsg.set("ERROR: in " + me + ": missing no_comment for username : <<" + \
+                            username + ">> for slot: " + slot_num_str)
+        error(f'{me}: missing no_comment for username: {username} slot_num: {slot_num}')
+        return False
+    if not isinstance(slot["no_comment"], str):
+        ioccc_last_errmsg.set("ERROR: in " + me + ": no_comment is not a string for username : <<" + \
+                            username + ">> for slot: " + slot_num_str)
+        error(f'{me}: no_comment not a string for username: {username} slot_num: {slot_num}')
+        return False
+    if slot["no_comment"] != NO_COMMENT_VALUE:
+        ioccc_last_errmsg.set("ERROR: in " + me + ": invalid JSON no_comment username : <<" + \
+                            username + ">> for slot: " + slot_num_str)
+        error(f'{me}: invalid JSON no_comment for username: {username} slot_num: {slot_num} '
+              f'slot["no_comment"]: {slot["no_comment"]} != '
+              f'NO_COMMENT_VALUE: {NO_COMMENT_VALUE}')
+        return False
+
+    # sanity check slot slot_JSON_format_version
+    #
+    if not slot.get("slot_JSON_format_version"):
+        ioccc_last_errmsg.set("ERROR: in " + me + ": missing slot_JSON_format_version for username : <<" + \
+                            username + ">> for slot: " + slot_num_str)
+        error(f'{me}: missing slot_JSON_format_version for username: {username} slot_num: {slot_num}')
+        return False
+    if not isinstance(slot["slot_JSON_format_version"], str):
+        ioccc_last_errmsg.set("ERROR: in " + me + \
+                            ": slot_JSON_format_version is not a string for username : <<" + \
+                            username + ">> for slot: " + slot_num_str)
+        error(f'{me}: slot_JSON_format_version not a string for username: {username} slot_num: {slot_num}')
+        return False
+    if slot["slot_JSON_format_version"] != SLOT_VERSION_VALUE:
+        ioccc_last_errmsg.set("ERROR: in " + me + ": invalid JSON slot_JSON_format_version for username : <<" + \
+                            username + ">> for slot: " + slot_num_str)
+        error(f'{me}: invalid slot_JSON_format_version for username: {username} slot_num: {slot_num} '
+              f'slot["slot_JSON_format_version"]: {slot["slot_JSON_format_version"]} != '
+              f'SLOT_VERSION_VALUE: {SLOT_VERSION_VALUE}')
+        return False
+
+    # slot information is valid
+    #
+    return True
+#
+# pylint: enable=too-many-return-statements
+
+
+def _read_slot_json_nolock(slot_json_file, username, slot_num):
+    """
+    Read, sanity check and cache the JSON file of a user's slot, without locking the slot
+
+    Slot JSON files are only ever replaced as a whole by write_json_file(), so
+    a reader sees either the old or the new slot JSON file, and need not lock the slot.
+
+    Given:
+        slot_json_file  JSON file of the user's slot
+        username        IOCCC submit server username
+        slot_num        slot number for a given username
+
+    Returns:
+        None ==> slot JSON file could not be read
+        False ==> slot JSON file is not valid slot information
+        slot information as a python dictionary
+
+    IMPORTANT: The returned python dictionary is shared with the cache.
+               The caller must NOT modify it.
+    """
+
+    # setup
+    #
+    me = "_read_slot_json_nolock"
+    debug(f'{me}: start')
+
+    # read the JSON file for the user's slot
+    #
+    try:
+        slot_stat = os.stat(slot_json_file)
+        with open(slot_json_file, "rb") as slot_file_fp:
+            slot = ioccc_json_loads(slot_file_fp.read())
+    except OSError:
+        return None
+
+    # sanity check the slot
+    #
+    if not validate_slot_dict(slot, username, slot_num):
+        error(f'{me}: validate_slot_dict failed for username: {username} slot_num: {slot_num}')
+        return False
+
+    # cache the sanity checked slot
+    #
+    json_cache_store(slot_json_file, slot_stat, slot)
+    return slot
+
+
+# pylint: disable=too-many-statements
+# pylint: disable=too-many-branches
+# pylint: disable=too-many-return-statements
+# pylint: disable=too-many-locals
+#
+def initialize_user_tree(username, user_dict=None):
+    """
+    Initialize the directory tree for a given user
+
+    We create the directory for the username if the directory does not exist.
+    We create the slot for the username if the slot directory does not exist.
+    We create the lock file for the slot it the lock file does not exist.
+    We initialize the slot JSON file it the slot JSON file does not exist.
+
+    NOTE: Because this may be called early, we cannot use HTML or other
+          error carping delivery.  We only set last_excpt are return None.
+
+    Given:
+        username    IOCCC submit server username
+        user_dict   user information for username as returned by lookup_username(username),
+                    or None ==> call lookup_username(username)
+
+    Returns:
+        None ==> invalid slot number or invalid user directory
+        != None ==> array of slot user data as a python dictionary
+    """
+
+    # setup
+    #
+    me = "initialize_user_tree"
+    debug(f'{me}: start')
+
+    # paranoia - username arg must be a string
     #
     if not isinstance(username, str):
-        ioccc_last_errmsg = f'{me}: username arg is not a string'
+        ioccc_last_errmsg.set(f'{me}: username arg is not a string')
         info(f'{me}: username arg is not a string')
         return None
 
     # paranoia - username cannot be too short
     #
     if len(username) < MIN_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         info(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         return None
 
     # paranoia - username cannot be too long
     #
     if len(username) > MAX_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         info(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         return None
 
@@ -2767,210 +3276,140 @@ def initialize_user_tree(username):
     # This also prevents username with /, and prevents it from being empty string,
     # thus one cannot create a username with system cracking "funny business".
     #
-    if not re.match(POSIX_SAFE_RE, username):
-        ioccc_last_errmsg = "ERROR: in " + me + ": username arg not POSIX safe"
+    if not POSIX_SAFE_PAT.fullmatch(username):
+        ioccc_last_errmsg.set("ERROR: in " + me + ": username arg not POSIX safe")
         info(f'{me}: username arg not POSIX safe')
         return None
 
     # setup
     #
-    if not lookup_username(username):
+    # If the caller has already looked up the username, we do not need to
+    # read the password file again.
+    #
+    if not user_dict:
+        user_dict = lookup_username(username)
+    if not user_dict or user_dict.get('username') != username:
         debug(f'{me}: lookup_username failed for username: {username}')
         return None
     user_dir = return_user_dir_path(username)
     if not user_dir:
         debug(f'{me}: return_user_dir_path failed for username: {username}')
         return False
-    umask(0o022)
+
+    # determine if this process has already formed the user directory tree
+    #
+    dirs_ready = username in ioccc_user_dirs_ready
 
     # be sure the user directory exists
     #
-    if not Path(user_dir).is_dir():
-        info(f'{me}: about to initialize user directory tree for username: {username}')
-    try:
-        makedirs(user_dir, mode=0o2770, exist_ok=True)
-    except OSError as errcode:
-        ioccc_last_errmsg = "ERROR: in " + me + ": cannot form user directory for user: <<" + \
-                        username + ">> exception: " + str(errcode)
-        return None
+    # We also note which slot directories already exist, with a single scan of the
+    # user directory, so that we only try to form the slot directories that are missing.
+    #
+    slot_dirs_found = set()
+    if not dirs_ready:
+        if not Path(user_dir).is_dir():
+            info(f'{me}: about to initialize user directory tree for username: {username}')
+        try:
+            makedirs(user_dir, mode=0o2770, exist_ok=True)
+            with os.scandir(user_dir) as entries:
+                slot_dirs_found = {entry.name for entry in entries if entry.is_dir()}
+        except OSError as errcode:
+            ioccc_last_errmsg.set("ERROR: in " + me + ": cannot form user directory for user: <<" + \
+                            username + ">> exception: " + str(errcode))
+            return None
 
     # process each slot for this user
     #
     slots = [None] * (MAX_SUBMIT_SLOT+1)
     for slot_num in range(0, MAX_SUBMIT_SLOT+1):
 
-        # determine the slot directory
+        # determine the slot directory and the JSON file for the user's slot
         #
-        slot_dir = return_slot_dir_path(username, slot_num)
+        slot_dir, slot_json_file = return_slot_paths(username, slot_num)
         if not slot_dir:
-            error(f'{me}: return_slot_dir_path failed for username: {username} slot_num: {slot_num}')
+            error(f'{me}: return_slot_paths failed for username: {username} slot_num: {slot_num}')
             return None
-        slot_num_str = str(slot_num)
 
         # be sure the slot directory exits
         #
-        try:
-            makedirs(slot_dir, mode=0o2770, exist_ok=True)
-        except OSError as errcode:
-            ioccc_last_errmsg = "ERROR: in " + me + ": cannot form slot directory: " + \
-                            slot_dir + " exception: " + str(errcode)
-            error(f'{me}: make directory for slot_dir: {slot_dir} '
-                  f'failed: <<{str(errcode)}>>')
-            return None
+        if not dirs_ready and str(slot_num) not in slot_dirs_found:
+            try:
+                makedirs(slot_dir, mode=0o2770, exist_ok=True)
+            except OSError as errcode:
+                ioccc_last_errmsg.set("ERROR: in " + me + ": cannot form slot directory: " + \
+                                slot_dir + " exception: " + str(errcode))
+                error(f'{me}: make directory for slot_dir: {slot_dir} '
+                      f'failed: <<{str(errcode)}>>')
+                return None
 
-        # Lock the slot
+        # use the cached slot if the slot JSON file is unchanged
         #
-        # This will create the lock file if needed.
+        # NOTE: A slot is only cached after it has been sanity checked.
         #
-        slot_lock_fd = lock_slot(username, slot_num)
-        if not slot_lock_fd:
-            error(f'{me}: lock_slot failed for username: {username} slot_num: {slot_num}')
-            return None
+        cached_slot = json_cache_lookup(slot_json_file)
+        if cached_slot:
+            slots[slot_num] = cached_slot
+            continue
 
-        # read the JSON file for the user's slot
+        # read the JSON file for the user's slot, without locking the slot
         #
-        # NOTE: We initialize the slot JSON file if the JSON file does not exist.
-        #
-        slot_json_file = return_slot_json_filename(username, slot_num)
-        if not slot_json_file:
-            error(f'{me}: return_slot_json_filename failed for username: {username} slot_num: {slot_num}')
-            unlock_slot()
-            return None
-        try:
-            with open(slot_json_file, "r", encoding="utf-8") as slot_file_fp:
-                slots[slot_num] = json.load(slot_file_fp)
+        slot = _read_slot_json_nolock(slot_json_file, username, slot_num)
+        if slot is None:
 
-                # sanity check slot no_comment
-                #
-                if not slots[slot_num]["no_comment"]:
-                    ioccc_last_errmsg = "ERROR: in " + me + ": missing no_comment for username : <<" + \
-                                        username + ">>" + ">> for slot: " + slot_num_str
-                    error(f'{me}: missing no_comment for username: {username} slot_num: {slot_num}')
-                    return None
-                if not isinstance(slots[slot_num]["no_comment"], str):
-                    ioccc_last_errmsg = "ERROR: in " + me + ": no_comment is not a string for username : <<" + \
-                                        username + ">>" + ">> for slot: " + slot_num_str
-                    error(f'{me}: no_comment not a string for username: {username} slot_num: {slot_num}')
-                    return None
-                if slots[slot_num]["no_comment"] != NO_COMMENT_VALUE:
-                    ioccc_last_errmsg = "ERROR: in " + me + ": invalid JSON no_comment username : <<" + \
-                                        username + ">> for slot: " + slot_num_str
-                    error(f'{me}: invalid JSON no_comment for username: {username} slot_num: {slot_num} '
-                          f'slots[slot_num]["no_comment"]: {slots[slot_num]["no_comment"]} != '
-                          f'NO_COMMENT_VALUE: {NO_COMMENT_VALUE}')
-                    return None
-
-                # sanity check slot slot_JSON_format_version
-                #
-                if not slots[slot_num]["slot_JSON_format_version"]:
-                    ioccc_last_errmsg = "ERROR: in " + me + ": missing slot_JSON_format_version for username : <<" + \
-                                        username + ">>" + ">> for slot: " + slot_num_str
-                    error(f'{me}: missing slot_JSON_format_version for username: {username} slot_num: {slot_num}')
-                    return None
-                if not isinstance(slots[slot_num]["slot_JSON_format_version"], str):
-                    ioccc_last_errmsg = "ERROR: in " + me + \
-                                        ": slot_JSON_format_version is not a string for username : <<" + \
-                                        username + ">>" + ">> for slot: " + slot_num_str
-                    error(f'{me}: slot_JSON_format_version not a string for username: {username} slot_num: {slot_num}')
-                    return None
-                if slots[slot_num]["slot_JSON_format_version"] != SLOT_VERSION_VALUE:
-                    ioccc_last_errmsg = "ERROR: in " + me + ": invalid JSON slot_JSON_format_version"
-                    error(f'{me}: invalid slot_JSON_format_version for username: {username} slot_num: {slot_num} '
-                          'slots[slot_num]["slot_JSON_format_version}]: '
-                          f'{slots[slot_num]["slot_JSON_format_version"]} != '
-                          f'SLOT_VERSION_VALUE: {SLOT_VERSION_VALUE}')
-                    unlock_slot()
-                    return None
-
-        except OSError:
-            debug(f'{me}: forming new slot file for username: {username} slot_num: {slot_num} '
-                  f'slot_json_file: {slot_json_file}')
-
-            # setup the JSON slot using the template
+            # Lock the slot, as we may need to form the slot JSON file
             #
-            t = Template(EMPTY_JSON_SLOT_TEMPLATE)
-
-            # initialize the slot JSON from the template
+            # This will create the lock file if needed.
             #
-            slots[slot_num] = json.loads(t.substitute( { 'NO_COMMENT_VALUE': NO_COMMENT_VALUE, \
-                                                         'SLOT_VERSION_VALUE': SLOT_VERSION_VALUE, \
-                                                         'slot_num': slot_num_str } ))
+            slot_lock_fd = lock_slot(username, slot_num)
+            if not slot_lock_fd:
+                error(f'{me}: lock_slot failed for username: {username} slot_num: {slot_num}')
 
-            # paranoia for slot no_comment
-            #
-            if not slots[slot_num]["no_comment"]:
-                ioccc_last_errmsg = "ERROR: in " + me + ": missing no_comment for username : <<" + \
-                                    username + ">>" + ">> for slot: " + slot_num_str
-                error(f'{me}: missing new no_comment for username: {username} slot_num: {slot_num}')
-                return None
-            if not isinstance(slots[slot_num]["no_comment"], str):
-                ioccc_last_errmsg = "ERROR: in " + me + ": no_comment is not a string for username : <<" + \
-                                    username + ">>" + ">> for slot: " + slot_num_str
-                error(f'{me}: new no_comment not a string for username: {username} slot_num: {slot_num}')
-                return None
-            if slots[slot_num]["no_comment"] != NO_COMMENT_VALUE:
-                ioccc_last_errmsg = "ERROR: in " + me + ": invalid JSON no_comment username : <<" + \
-                                    username + ">> for slot: " + slot_num_str
-                error(f'{me}: invalid new JSON no_comment for username: {username} slot_num: {slot_num} '
-                      f'slots[slot_num]["no_comment"]: {slots[slot_num]["no_comment"]} != '
-                      f'NO_COMMENT_VALUE: {NO_COMMENT_VALUE}')
+                # the directory tree may have been removed, so form it again next time
+                #
+                ioccc_user_dirs_ready.discard(username)
                 return None
 
-            # paranoia for slot slot_JSON_format_version
+            # read the JSON file again, in case another process formed it before we locked the slot
             #
-            if not slots[slot_num]["slot_JSON_format_version"]:
-                ioccc_last_errmsg = "ERROR: in " + me + ": missing slot_JSON_format_version for username : <<" + \
-                                    username + ">>" + ">> for slot: " + slot_num_str
-                error(f'{me}: missing new slot_JSON_format_version for username: {username} slot_num: {slot_num}')
-                return None
-            if not isinstance(slots[slot_num]["slot_JSON_format_version"], str):
-                ioccc_last_errmsg = "ERROR: in " + me + \
-                                    ": slot_JSON_format_version is not a string for username : <<" + \
-                                    username + ">>" + ">> for slot: " + slot_num_str
-                error(f'{me}: new slot_JSON_format_version not a string for username: {username} slot_num: {slot_num}')
-                return None
-            if slots[slot_num]["slot_JSON_format_version"] != SLOT_VERSION_VALUE:
-                ioccc_last_errmsg = "ERROR: in " + me + ": invalid JSON slot_JSON_format_version"
-                error(f'{me}: invalid new slot_JSON_format_version for username: {username} slot_num: {slot_num} '
-                      'slots[slot_num]["slot_JSON_format_version}]: '
-                      f'{slots[slot_num]["slot_JSON_format_version"]} != '
-                      f'SLOT_VERSION_VALUE: {SLOT_VERSION_VALUE}')
-                unlock_slot()
-                return None
+            slot = _read_slot_json_nolock(slot_json_file, username, slot_num)
+            if slot is None:
+                debug(f'{me}: forming new slot file for username: {username} slot_num: {slot_num} '
+                      f'slot_json_file: {slot_json_file}')
 
-            # update the JSON for the slot
-            #
-            try:
-                with open(slot_json_file, mode="w", encoding="utf-8") as slot_file_fp:
-                    slot_file_fp.write(json.dumps(slots[slot_num], ensure_ascii=True, indent=4))
-                    slot_file_fp.write('\n')
+                # initialize the slot JSON from the pre-formed empty slot
+                #
+                slot = EMPTY_SLOTS[slot_num].copy()
 
-                    # close slot file
-                    #
-                    # NOTE: We explicitly manage the close because we just did a write
-                    #       and we want to catch the case where a write buffer may have
-                    #       not been fully flushed to the file.
-                    #
-                    try:
-                        slot_file_fp.close()
+                # paranoia - sanity check the new slot
+                #
+                if not validate_slot_dict(slot, username, slot_num):
+                    error(f'{me}: validate_slot_dict failed for new slot for username: {username} '
+                          f'slot_num: {slot_num}')
+                    unlock_slot()
+                    return None
 
-                    except OSError as errcode:
-                        ioccc_last_errmsg = "ERROR: in " + me + ": failed to close: " + slot_json_file + \
-                                            " exception: " + str(errcode)
-                        error(f'{me}: close writing for slot_json_file: {slot_json_file} '
-                              f'failed: <<{str(errcode)}>>')
-                        return None
+                # update the JSON for the slot
+                #
+                if not write_json_file(slot_json_file, slot, compact=True):
+                    error(f'{me}: write_json_file failed for username: {username} slot_num: {slot_num} '
+                          f'slot_json_file: {slot_json_file}')
+                    unlock_slot()
+                    return None
 
-            except OSError as errcode:
-                ioccc_last_errmsg = "ERROR: in " + me + ": unable to write JSON slot file: " + \
-                                slot_json_file + " exception: " + str(errcode)
-                error(f'{me}: open for writing slot_json_file: {slot_json_file} failed: <<{str(errcode)}>>')
-                unlock_slot()
-                return None
+            # Unlock the slot
+            #
+            unlock_slot()
 
-        # Unlock the slot
+        # the slot JSON file must be valid
         #
-        unlock_slot()
+        if not slot:
+            error(f'{me}: invalid slot JSON file for username: {username} slot_num: {slot_num}')
+            return None
+        slots[slot_num] = slot
+
+    # note that the directory tree for the user has been formed
+    #
+    ioccc_user_dirs_ready.add(username)
 
     # Return success
     #
@@ -2980,6 +3419,7 @@ def initialize_user_tree(username):
 # pylint: enable=too-many-statements
 # pylint: enable=too-many-branches
 # pylint: enable=too-many-return-statements
+# pylint: enable=too-many-locals
 
 
 # pylint: disable=too-many-return-statements
@@ -3025,7 +3465,7 @@ def get_json_slot(username, slot_num):
     # This also prevents username with /, and prevents it from being empty string,
     # thus one cannot create a username with system cracking "funny business".
     #
-    if not re.match(POSIX_SAFE_RE, username):
+    if not POSIX_SAFE_PAT.fullmatch(username):
         info(f'{me}: username arg not POSIX safe')
         return None
 
@@ -3040,46 +3480,25 @@ def get_json_slot(username, slot_num):
     if not lookup_username(username):
         debug(f'{me}: lookup_username failed for username: {username}')
         return None
-    user_dir = return_user_dir_path(username)
-    if not user_dir:
-        debug(f'{me}: return_user_dir_path failed for username: {username}')
-        return None
-
-    # process this slot for this user
-    #
-    slot = None
 
     # setup for the user's slot
     #
-    slot_dir = return_slot_dir_path(username, slot_num)
+    slot_dir, slot_json_file = return_slot_paths(username, slot_num)
     if not slot_dir:
-        error(f'{me}: return_slot_dir_path failed for username: {username} slot_num: {slot_num}')
-        return None
-    slot_json_file = return_slot_json_filename(username, slot_num)
-    if not slot_json_file:
-        error(f'{me}: return_slot_json_filename failed for username: {username} slot_num: {slot_num}')
-        return None
-
-    # first and foremost, lock the user slot
-    #
-    slot_lock_fd = lock_slot(username, slot_num)
-    if not slot_lock_fd:
-        error(f'{me}: lock_slot failed for username: {username} slot_num: {slot_num}')
+        error(f'{me}: return_slot_paths failed for username: {username} slot_num: {slot_num}')
         return None
 
     # read the JSON file for the user's slot
     #
+    # NOTE: Slot JSON files are only ever replaced as a whole by write_json_file(),
+    #       so we do not need to lock the slot to read a complete slot JSON file.
+    #
     slot = read_json_file(slot_json_file)
     if not slot:
         error(f'{me}: read_json_file failed for username: {username} slot_num: {slot_num} '
               f'slot_json_file: {slot_json_file}')
-        unlock_slot()
         return None
 
-    # unlock the user slot
-    #
-    unlock_slot()
-
     # return slot information as a python dictionary
     #
     return slot
@@ -3103,13 +3522,9 @@ def get_all_json_slots(username):
 
     # setup
     #
-    me = inspect.currentframe().f_code.co_name
+    me = "get_all_json_slots"
     debug(f'{me}: start')
 
-    # setup
-    #
-    umask(0o022)
-
     # paranoia - username arg must be a string
     #
     if not isinstance(username, str):
@@ -3133,13 +3548,14 @@ def get_all_json_slots(username):
     # This also prevents username with /, and prevents it from being empty string,
     # thus one cannot create a username with system cracking "funny business".
     #
-    if not re.match(POSIX_SAFE_RE, username):
+    if not POSIX_SAFE_PAT.fullmatch(username):
         info(f'{me}: username arg not POSIX safe')
         return None
 
     # validate username
     #
-    if not lookup_username(username):
+    user_dict = lookup_username(username)
+    if not user_dict:
         debug(f'{me}: lookup_username failed for username: {username}')
         return None
     user_dir = return_user_dir_path(username)
@@ -3149,7 +3565,10 @@ def get_all_json_slots(username):
 
     # initialize the user tree in case this is a new user
     #
-    slots = initialize_user_tree(username)
+    # NOTE: We pass the user information that we just looked up, so that
+    #       initialize_user_tree() does not look up the username again.
+    #
+    slots = initialize_user_tree(username, user_dict)
     if not slots:
         error(f'{me}: initialize_user_tree failed for username: {username}')
         return None
@@ -3161,12 +3580,129 @@ def get_all_json_slots(username):
 # pylint: enable=too-many-return-statements
 
 
+def hash_file(filename):
+    """
+    Return the SHA256 hash and length of a file
+
+    The file is read in chunks rather than reading the entire file into memory.
+    The length is the file position after the file has been read, so no
+    additional stat of the file is needed.
+
+    Given:
+        filename    file to hash
+
+    Returns:
+        None, None ==> unable to read the file
+        sha256_hex, length ==> SHA256 hash of the file in ASCII hex characters,
+                               and the length of the file in bytes
+    """
+
+    # setup
+    #
+    me = inspect.currentframe().f_code.co_name
+    debug(f'{me}: start')
+
+    # hash the file
+    #
+    try:
+        with open(filename, "rb") as file_fp:
+
+            # NOTE: hashlib.file_digest() was added in Python 3.11.
+            #
+            if hasattr(hashlib, "file_digest"):
+                result = hashlib.file_digest(file_fp, "sha256")
+            else:
+                result = hashlib.sha256()
+                for chunk in iter(lambda: file_fp.read(HASH_CHUNK_SIZE), b''):
+                    result.update(chunk)
+
+            # the whole file has been read, so the file position is its length
+            #
+            length = file_fp.tell()
+
+    except OSError as errcode:
+        ioccc_last_errmsg.set("ERROR: in " + me + ": failed to open: " + filename + " exception: " + str(errcode))
+        error(f'{me}: open for filename: {filename} failed: <<{str(errcode)}>>')
+        return None, None
+
+    # paranoia
+    #
+    sha256_hex = result.hexdigest()
+    if len(sha256_hex) != SHA256_HEXLEN:
+        ioccc_last_errmsg.set("ERROR: in " + me + ": invalid SHA-256 hash length for: " + filename)
+        error(f'{me}: invalid SHA-256 hash return')
+        return None, None
+
+    # return the SHA256 hash and length
+    #
+    return sha256_hex, length
+
+
+def save_and_hash_file(src_fp, dest_file):
+    """
+    Copy an open binary stream into a file while computing its SHA256 hash
+
+    The data is hashed as it is written, so the file does not have to be read
+    back in order to determine its SHA256 hash.  The data is copied in
+    UPLOAD_CHUNK_SIZE chunks.
+
+    Given:
+        src_fp      open binary stream to read from, such as an uploaded file stream
+        dest_file   file to write
+
+    Returns:
+        None, None ==> unable to write dest_file
+        != None, length ==> SHA256 hash in ASCII hex characters, length in bytes written to dest_file
+    """
+
+    # setup
+    #
+    me = inspect.currentframe().f_code.co_name
+    debug(f'{me}: start')
+    result = hashlib.sha256()
+    length = 0
+
+    # copy and hash
+    #
+    try:
+        with open(dest_file, "wb") as dest_fp:
+            for chunk in iter(lambda: src_fp.read(UPLOAD_CHUNK_SIZE), b''):
+                dest_fp.write(chunk)
+                result.update(chunk)
+                length += len(chunk)
+
+            # close the file
+            #
+            # NOTE: We explicitly manage the close because we just did a write
+            #       and we want to catch the case where a write buffer may have
+            #       not been fully flushed to the file.
+            #
+            try:
+                dest_fp.close()
+
+            except OSError as errcode:
+                ioccc_last_errmsg.set("ERROR: in " + me + ": failed to close: " + dest_file + \
+                                    " exception: " + str(errcode))
+                error(f'{me}: close for writing {dest_file} failed: <<{str(errcode)}>>')
+                return None, None
+
+    except OSError as errcode:
+        ioccc_last_errmsg.set("ERROR: in " + me + ": failed to write: " + dest_file + " exception: " + str(errcode))
+        error(f'{me}: write of dest_file: {dest_file} failed: <<{str(errcode)}>>')
+        return None, None
+
+    # return the SHA256 hash and length
+    #
+    debug(f'{me}: wrote {length} bytes to dest_file: {dest_file}')
+    return result.hexdigest(), length
+
+
 # pylint: disable=too-many-return-statements
 # pylint: disable=too-many-locals
 # pylint: disable=too-many-statements
 # pylint: disable=too-many-branches
 #
-def update_slot(username, slot_num, slot_file):
+def update_slot(username, slot_num, slot_file, sha256_hex=None, length=None):
     """
     Update a given slot for a given user with a new file
 
@@ -3174,37 +3710,46 @@ def update_slot(username, slot_num, slot_file):
         username    IOCCC submit server username
         slot_num    slot number for a given username
         slot_file   filename stored under a given slot
+        sha256_hex  SHA256 hash of slot_file in ASCII hex characters, or
+                    None ==> read slot_file to compute the SHA256 hash
+        length      length of slot_file in bytes, or
+                    None ==> use the size of slot_file
+
+    NOTE: The sha256_hex and length of a file written by save_and_hash_file()
+          may be passed in order to avoid reading slot_file a second time.
 
     Returns:
-        True        recorded and reported the SHA256 hash of slot_file
+        != False    recorded and reported the SHA256 hash of slot_file,
+                    return the updated slot information as a python dictionary
         False       some error was detected
+
+    IMPORTANT: The returned python dictionary is shared with the cache.
+               The caller must NOT modify it.
     """
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
     me = inspect.currentframe().f_code.co_name
     debug(f'{me}: start')
 
     # paranoia - username arg must be a string
     #
     if not isinstance(username, str):
-        ioccc_last_errmsg = f'{me}: username arg is not a string'
+        ioccc_last_errmsg.set(f'{me}: username arg is not a string')
         info(f'{me}: username arg is not a string')
         return False
 
     # paranoia - username cannot be too short
     #
     if len(username) < MIN_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         info(f'{me}: username arg is too short: {len(username)} < {MIN_USERNAME_LENGTH}')
         return False
 
     # paranoia - username cannot be too long
     #
     if len(username) > MAX_USERNAME_LENGTH:
-        ioccc_last_errmsg = f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}'
+        ioccc_last_errmsg.set(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         info(f'{me}: username arg is too long: {len(username)} > {MIN_USERNAME_LENGTH}')
         return False
 
@@ -3213,44 +3758,59 @@ def update_slot(username, slot_num, slot_file):
     # This also prevents username with /, and prevents it from being empty string,
     # thus one cannot create a username with system cracking "funny business".
     #
-    if not re.match(POSIX_SAFE_RE, username):
-        ioccc_last_errmsg = "ERROR: in " + me + ": username arg not POSIX safe"
+    if not POSIX_SAFE_PAT.fullmatch(username):
+        ioccc_last_errmsg.set("ERROR: in " + me + ": username arg not POSIX safe")
         info(f'{me}: username arg not POSIX safe')
         return False
 
     # paranoia - slot_num arg must be an integer
     #
     if not isinstance(slot_num, int):
-        ioccc_last_errmsg = f'{me}: slot_num arg is not an int'
+        ioccc_last_errmsg.set(f'{me}: slot_num arg is not an int')
         info(f'{me}: slot_num arg is not an int')
         return None
 
-    # initialize user if needed
+    # determine the slot directory and the JSON file for the user's slot
     #
-    slots = initialize_user_tree(username)
-    if not slots:
-        error(f'{me}: initialize_user_tree failed for username: {username}')
+    slot_dir, slot_json_file = return_slot_paths(username, slot_num)
+    if not slot_dir:
+        error(f'{me}: return_slot_paths failed for username: {username} slot_num: {slot_num}')
         return False
+
+    # initialize user if needed
+    #
+    # Once this process has formed the user directory tree, and the slot JSON file
+    # exists, there is nothing for initialize_user_tree() to do.
+    #
+    if username not in ioccc_user_dirs_ready or not os.path.isfile(slot_json_file):
+        slots = initialize_user_tree(username)
+        if not slots:
+            error(f'{me}: initialize_user_tree failed for username: {username}')
+            return False
     slot_num_str = str(slot_num)
 
-    # open the file
+    # case: we were given the SHA256 hash of the file
     #
-    try:
-        with open(slot_file, "rb") as file_fp:
-            result = hashlib.sha256(file_fp.read())
+    if sha256_hex:
 
-            # paranoia
-            #
-            if not result or len(result.hexdigest()) != SHA256_HEXLEN:
-                error(f'{me}: invalid SHA-256 hash return')
-                return False
+        # paranoia
+        #
+        if not isinstance(sha256_hex, str) or len(sha256_hex) != SHA256_HEXLEN:
+            ioccc_last_errmsg.set("ERROR: in " + me + ": invalid sha256_hex arg for username: <<" + username + \
+                                ">> slot: " + slot_num_str)
+            error(f'{me}: invalid sha256_hex arg for username: {username} slot_num: {slot_num}')
+            return False
 
-    except OSError as errcode:
-        ioccc_last_errmsg = "ERROR: in " + me + ": failed to open for username: <<" + username + ">> slot: " + \
-                        slot_num_str + " file: " + slot_file + " exception: " + str(errcode)
-        error(f'{me}: open for username: {username} slot_num: {slot_num} slot_file: {slot_file} '
-              f'failed: <<{str(errcode)}>>')
-        return False
+    # case: compute the SHA256 hash of the file
+    #
+    else:
+        sha256_hex, file_length = hash_file(slot_file)
+        if not sha256_hex:
+            error(f'{me}: hash_file failed for username: {username} slot_num: {slot_num} '
+                  f'slot_file: {slot_file}')
+            return False
+        if length is None:
+            length = file_length
 
     # lock the slot because we are about to change it
     #
@@ -3261,11 +3821,6 @@ def update_slot(username, slot_num, slot_file):
 
     # read the JSON file for the user's slot
     #
-    slot_json_file = return_slot_json_filename(username, slot_num)
-    if not slot_json_file:
-        error(f'{me}: return_slot_json_filename failed for username: {username} slot_num: {slot_num}')
-        unlock_slot()
-        return False
     slot = read_json_file(slot_json_file)
     if not slot:
         error(f'{me}: read_json_file failed for username: {username} slot_num: {slot_num} '
@@ -3278,14 +3833,6 @@ def update_slot(username, slot_num, slot_file):
     #
     if slot['filename']:
 
-        # determine the slot directory
-        #
-        slot_dir = return_slot_dir_path(username, slot_num)
-        if not slot_dir:
-            error(f'{me}: return_slot_dir_path failed for username: {username} slot_num: {slot_num}')
-            unlock_slot()
-            return False
-
         # remove previously saved file
         #
         old_file = slot_dir + "/" + slot['filename']
@@ -3293,9 +3840,9 @@ def update_slot(username, slot_num, slot_file):
             try:
                 os.remove(old_file)
             except OSError as errcode:
-                ioccc_last_errmsg = "ERROR: in " + me + ": failed to remove old file: " + \
+                ioccc_last_errmsg.set("ERROR: in " + me + ": failed to remove old file: " + \
                                     old_file + " from slot: " + slot_num_str + " file: " + \
-                                    slot['filename'] + " exception: " + str(errcode)
+                                    slot['filename'] + " exception: " + str(errcode))
                 error(f'{me}: os.remove({old_file} for username: {username} slot_num: {slot_num} '
                       f'failed: <<{str(errcode)}>>')
                 unlock_slot()
@@ -3305,18 +3852,15 @@ def update_slot(username, slot_num, slot_file):
     #
     slot['status'] = "Uploaded file into slot"
     slot['filename'] = os.path.basename(slot_file)
-    slot['length'] = os.path.getsize(slot_file)
-    dt = datetime.now(timezone.utc).replace(tzinfo=None)
-    slot['date'] = re.sub(r'\.[0-9]{6}$', '', str(dt)) + " UTC"
-    slot['sha256'] = result.hexdigest()
+    if length is None:
+        slot['length'] = os.path.getsize(slot_file)
+    else:
+        slot['length'] = length
+    slot['date'] = datetime.now(timezone.utc).strftime(SLOT_DATE_FORMAT)
+    slot['sha256'] = sha256_hex
 
     # save JSON data for the slot
     #
-    slot_json_file = return_slot_json_filename(username, slot_num)
-    if not slot_json_file:
-        error(f'{me}: return_slot_json_filename failed for username: {username} slot_num: {slot_num}')
-        unlock_slot()
-        return False
     if not write_slot_json(slot_json_file, slot):
         error(f'{me}: write_slot_json failed for username: {username} slot_num: {slot_num}')
         unlock_slot()
@@ -3326,7 +3870,7 @@ def update_slot(username, slot_num, slot_file):
     #
     unlock_slot()
     info(f'{me}: updated slot for username: {username} slot_num: {slot_num}')
-    return True
+    return slot
 #
 # pylint: enable=too-many-return-statements
 # pylint: enable=too-many-locals
@@ -3378,7 +3922,7 @@ def update_slot_status(username, slot_num, status):
     # This also prevents username with /, and prevents it from being empty string,
     # thus one cannot create a username with system cracking "funny business".
     #
-    if not re.match(POSIX_SAFE_RE, username):
+    if not POSIX_SAFE_PAT.fullmatch(username):
         info(f'{me}: username arg not POSIX safe')
         return False
 
@@ -3420,11 +3964,6 @@ def update_slot_status(username, slot_num, status):
 
     # save JSON data for the slot
     #
-    slot_json_file = return_slot_json_filename(username, slot_num)
-    if not slot_json_file:
-        error(f'{me}: return_slot_json_filename failed for username: {username} slot_num: {slot_num}')
-        unlock_slot()
-        return False
     if not write_slot_json(slot_json_file, slot):
         error(f'{me}: write_slot_json failed for username: {username} slot_num: {slot_num}')
         unlock_slot()
@@ -3453,28 +3992,133 @@ def read_json_file(json_file):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
-    me = inspect.currentframe().f_code.co_name
+    me = "read_json_file"
     debug(f'{me}: start')
 
     # try to read JSON contents
     #
     try:
-        with open(json_file, 'r', encoding="utf-8") as j_fp:
+        with open(json_file, 'rb') as j_fp:
 
             # return slot information as a python dictionary
             #
-            return json.load(j_fp)
+            return ioccc_json_loads(j_fp.read())
 
     except OSError as errcode:
-        ioccc_last_errmsg = "ERROR: in " + me + ": cannot open JSON in: " + \
-                        json_file + " exception: " + str(errcode)
+        ioccc_last_errmsg.set("ERROR: in " + me + ": cannot open JSON in: " + \
+                        json_file + " exception: " + str(errcode))
         error(f'{me}: read JSON for json_file: {json_file} '
               f'failed: <<{str(errcode)}>>')
         return []
 
 
+def write_json_file(json_file, json_obj, compact=False):
+    """
+    Atomically write a python object as JSON into a file
+
+    The JSON is written into a temporary file in the same directory as json_file,
+    the temporary file is flushed to disk, and then the temporary file is renamed
+    onto json_file.  A reader of json_file will see either the previous or the new
+    contents, never an empty or partially written file.
+
+    If json_file already exists, its permissions, owner and group are kept.  Otherwise
+    json_file is created with mode 0644.
+
+    IMPORTANT: The rename replaces json_file with a new file.  So that, for example, root
+               running a command line tool does not leave a file that the web server can
+               no longer write, the temporary file is given the owner and group of json_file.
+               If that is not permitted, json_file is not written.
+
+    If json_file already contains the same JSON, json_file is not rewritten.
+
+    Given:
+        json_file   JSON file to write
+        json_obj    python object to write as JSON
+        compact     True ==> write compact JSON, see ioccc_json_dumps()
+
+    Returns:
+        True    json_file written
+        False   unable to write json_file
+    """
+
+    # setup
+    #
+    me = inspect.currentframe().f_code.co_name
+    debug(f'{me}: start')
+
+    # determine the mode, owner and group of the JSON file
+    #
+    try:
+        json_stat = os.stat(json_file)
+        json_mode = stat.S_IMODE(json_stat.st_mode)
+    except OSError:
+        json_stat = None
+        json_mode = 0o644
+
+    # do nothing if the JSON file already holds the same JSON
+    #
+    json_data = ioccc_json_dumps(json_obj, compact)
+    try:
+        with open(json_file, "rb") as json_fp:
+            if json_fp.read(len(json_data) + 1) == json_data:
+                debug(f'{me}: json_file unchanged: {json_file}')
+                return True
+    except OSError:
+        pass
+
+    # form the temporary file in the same directory, so that the rename is atomic
+    #
+    json_cache_forget(json_file)
+    try:
+        tmp_fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(json_file) or ".", prefix=".tmp_")
+
+    except OSError as errcode:
+        ioccc_last_errmsg.set("ERROR: in " + me + ": cannot create temporary file for: " + \
+                            json_file + " exception: " + str(errcode))
+        error(f'{me}: mkstemp for json_file: {json_file} failed: <<{str(errcode)}>>')
+        return False
+
+    # write JSON into the temporary file and rename it onto the JSON file
+    #
+    try:
+        with os.fdopen(tmp_fd, mode="wb") as tmp_fp:
+            tmp_fp.write(json_data)
+            tmp_fp.flush()
+            os.fsync(tmp_fp.fileno())
+
+            # keep the owner and group of the JSON file
+            #
+            if json_stat:
+                tmp_stat = os.fstat(tmp_fp.fileno())
+                if tmp_stat.st_uid != json_stat.st_uid or tmp_stat.st_gid != json_stat.st_gid:
+                    os.fchown(tmp_fp.fileno(), json_stat.st_uid, json_stat.st_gid)
+            os.fchmod(tmp_fp.fileno(), json_mode)
+
+            # close the temporary file
+            #
+            # NOTE: We explicitly manage the close because we just did a write
+            #       and we want to catch the case where a write buffer may have
+            #       not been fully flushed to the file.
+            #
+            tmp_fp.close()
+
+        os.replace(tmp_file, json_file)
+
+    except OSError as errcode:
+        ioccc_last_errmsg.set("ERROR: in " + me + ": unable to write JSON file: " + \
+                            json_file + " exception: " + str(errcode))
+        error(f'{me}: write of json_file: {json_file} failed: <<{str(errcode)}>>')
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        return False
+
+    # JSON file written
+    #
+    return True
+
+
 # pylint: disable=too-many-statements
 # pylint: disable=too-many-branches
 # pylint: disable=too-many-return-statements
@@ -3498,37 +4142,52 @@ def read_state():
     # setup
     #
     # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
-    me = inspect.currentframe().f_code.co_name
+    global ioccc_state_dates
+    me = "read_state"
     debug(f'{me}: start')
 
-    # Lock the state file
+    # use the cached state if the state file is unchanged
     #
-    state_lock_fd = ioccc_file_lock(STATE_FILE_LOCK)
-    if not state_lock_fd:
-        error(f'{me}: failed to lock file for STATE_FILE_LOCK: {STATE_FILE_LOCK}')
-        return None, None
+    state = json_cache_lookup(STATE_FILE)
+    if not state:
 
-    # If there is no state file, or if the state file is empty, copy it from the initial state file
-    #
-    if not os.path.isfile(STATE_FILE) or os.path.getsize(STATE_FILE) <= 0:
-        try:
-            shutil.copy2(INIT_STATE_FILE, STATE_FILE, follow_symlinks=True)
+        # Lock the state file
+        #
+        state_lock_fd = ioccc_file_lock(STATE_FILE_LOCK)
+        if not state_lock_fd:
+            error(f'{me}: failed to lock file for STATE_FILE_LOCK: {STATE_FILE_LOCK}')
+            return None, None
 
+        # If there is no state file, or if the state file is empty, copy it from the initial state file
+        #
+        if not os.path.isfile(STATE_FILE) or os.path.getsize(STATE_FILE) <= 0:
+            try:
+                shutil.copy2(INIT_STATE_FILE, STATE_FILE, follow_symlinks=True)
+
+            except OSError as errcode:
+                ioccc_last_errmsg.set("ERROR: in " + me + ": cannot cp -p " + INIT_STATE_FILE + \
+                                    " " + STATE_FILE + " exception: " + str(errcode))
+                error(f'{me}: cp -p {INIT_STATE_FILE} {STATE_FILE} failed: <<{str(errcode)}>>')
+                ioccc_file_unlock()
+                return None, None
+
+        # read and cache the state
+        #
+        try:
+            state_stat = os.stat(STATE_FILE)
         except OSError as errcode:
-            ioccc_last_errmsg = "ERROR: in " + me + ": cannot cp -p " + INIT_STATE_FILE + \
-                                " " + STATE_FILE + " exception: " + str(errcode)
-            error(f'{me}: cp -p {INIT_STATE_FILE} {STATE_FILE} failed: <<{str(errcode)}>>')
+            ioccc_last_errmsg.set("ERROR: in " + me + ": cannot stat state file: " + STATE_FILE + \
+                                " exception: " + str(errcode))
+            error(f'{me}: stat of {STATE_FILE} failed: <<{str(errcode)}>>')
             ioccc_file_unlock()
             return None, None
+        state = read_json_file(STATE_FILE)
+        if state:
+            json_cache_store(STATE_FILE, state_stat, state)
 
-    # read the state
-    #
-    state = read_json_file(STATE_FILE)
-
-    # Unlock the state file
-    #
-    ioccc_file_unlock()
+        # Unlock the state file
+        #
+        ioccc_file_unlock()
 
     # detect if we were unable to read the state file
     #
@@ -3539,15 +4198,15 @@ def read_state():
     # sanity check state file no_comment
     #
     if not state["no_comment"]:
-        ioccc_last_errmsg = "ERROR: in " + me + ": missing no_comment in state file"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": missing no_comment in state file")
         error(f'{me}: missing no_comment for STATE_FILE: {STATE_FILE}')
         return None, None
     if not isinstance(state["no_comment"], str):
-        ioccc_last_errmsg = "ERROR: in " + me + ": no_comment is not a string in state file"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": no_comment is not a string in state file")
         error(f'{me}: no_comment not a string for STATE_FILE: {STATE_FILE}')
         return None, None
     if state["no_comment"] != NO_COMMENT_VALUE:
-        ioccc_last_errmsg = "ERROR: in " + me + ": invalid JSON no_comment in state file"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": invalid JSON no_comment in state file")
         error(f'{me}: invalid JSON no_comment for STATE_FILE: {STATE_FILE} '
               f'state["no_comment"]: {state["no_comment"]} != '
               f'NO_COMMENT_VALUE: {NO_COMMENT_VALUE}')
@@ -3556,16 +4215,16 @@ def read_state():
     # sanity check state file state_JSON_format_version
     #
     if not state["state_JSON_format_version"]:
-        ioccc_last_errmsg = "ERROR: in " + me + ": missing state_JSON_format_version in state file"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": missing state_JSON_format_version in state file")
         error(f'{me}: missing state_JSON_format_version for STATE_FILE: {STATE_FILE}')
         return None, None
     if not isinstance(state["state_JSON_format_version"], str):
-        ioccc_last_errmsg = "ERROR: in " + me + \
-                            ": state_JSON_format_version is not a string in state file"
+        ioccc_last_errmsg.set("ERROR: in " + me + \
+                            ": state_JSON_format_version is not a string in state file")
         error(f'{me}: state_JSON_format_version not a string for STATE_FILE: {STATE_FILE}')
         return None, None
     if state["state_JSON_format_version"] != STATE_VERSION_VALUE:
-        ioccc_last_errmsg = "ERROR: in " + me + ": invalid JSON state_JSON_format_version in state file"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": invalid JSON state_JSON_format_version in state file")
         error(f'{me}: invalid state_JSON_format_version for STATE_FILE: {STATE_FILE} '
               'state["state_JSON_format_version}]: '
               f'{state["state_JSON_format_version"]} != '
@@ -3573,21 +4232,27 @@ def read_state():
         unlock_slot()
         return None, None
 
+    # reuse the previously parsed dates if the date strings are unchanged
+    #
+    if ioccc_state_dates and \
+       ioccc_state_dates[0] == state['open_date'] and ioccc_state_dates[1] == state['close_date']:
+        return ioccc_state_dates[2], ioccc_state_dates[3]
+
     # convert open date string into a datetime value
     #
     if not state['open_date']:
-        ioccc_last_errmsg = "ERROR: in " + me + ": state file missing open_date"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": state file missing open_date")
         error(f'{me}: missing open_date for STATE_FILE: {STATE_FILE}')
         return None, None
     if not isinstance(state['open_date'], str):
-        ioccc_last_errmsg = "ERROR: in " + me + ": state file open_date is not a string"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": state file open_date is not a string")
         error(f'{me}: open_date is not a string for STATE_FILE: {STATE_FILE}')
         return None, None
     try:
         open_datetime = datetime.strptime(state['open_date'], DATETIME_FORMAT)
     except ValueError as errcode:
-        ioccc_last_errmsg = "ERROR: in " + me + ": state file open_date is not in proper datetime format: <<" + \
-                      state['open_date'] + ">> exception: <<" + str(errcode) + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": state file open_date is not in proper datetime format: <<" + \
+                      state['open_date'] + ">> exception: <<" + str(errcode) + ">>")
         error(f'{me}: datetime.strptime of open_date for STATE_FILE: {STATE_FILE} '
               f'open_date: {state["open_date"]} failed: <<{str(errcode)}>>')
         return None, None
@@ -3595,22 +4260,27 @@ def read_state():
     # convert close date string into a datetime value
     #
     if not state['close_date']:
-        ioccc_last_errmsg = "ERROR: in " + me + ": state file missing close_date"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": state file missing close_date")
         error(f'{me}: missing close_date for STATE_FILE: {STATE_FILE}')
         return None, None
     if not isinstance(state['close_date'], str):
-        ioccc_last_errmsg = "ERROR: in " + me + ": state file close_date is not a string"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": state file close_date is not a string")
         error(f'{me}: close_date is not a string for STATE_FILE: {STATE_FILE}')
         return None, None
     try:
         close_datetime = datetime.strptime(state['close_date'], DATETIME_FORMAT)
     except ValueError as errcode:
-        ioccc_last_errmsg = "ERROR: in " + me + ": state file close_date is not in proper datetime format: <<" + \
-                      state['close_date'] + ">> exception: <<" + str(errcode) + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": state file close_date is not in proper datetime format: <<" + \
+                      state['close_date'] + ">> exception: <<" + str(errcode) + ">>")
         error(f'{me}: datetime.strptime of close_date for STATE_FILE: {STATE_FILE} '
               f'close_date: {state["close_date"]} failed: <<{str(errcode)}>>')
         return None, None
 
+    # save the parsed dates for next time
+    #
+    ioccc_state_dates = (state['open_date'], state['close_date'], open_datetime, close_datetime,
+                         str(close_datetime).replace('+00:00', ''))
+
     # return open and close dates
     #
     return open_datetime, close_datetime
@@ -3635,8 +4305,6 @@ def update_state(open_date, close_date):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
     me = inspect.currentframe().f_code.co_name
     debug(f'{me}: start')
     write_sucessful = True
@@ -3644,15 +4312,15 @@ def update_state(open_date, close_date):
     # firewall - open_date must be a string in DATETIME_FORMAT format
     #
     if not isinstance(open_date, str):
-        ioccc_last_errmsg = "ERROR: in " + me + ": open_date is not a string"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": open_date is not a string")
         error(f'{me}: open_date arg is not a string')
         return False
     try:
         # pylint: disable=unused-variable
         open_datetime = datetime.strptime(open_date, DATETIME_FORMAT)
     except ValueError as errcode:
-        ioccc_last_errmsg = "ERROR: in " + me + ": open_date arg not in proper datetime format: <<" + \
-                      open_date + ">> exception: <<" + str(errcode) + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": open_date arg not in proper datetime format: <<" + \
+                      open_date + ">> exception: <<" + str(errcode) + ">>")
         error(f'{me}: datetime.strptime of open_date arg: {open_date} '
               f'failed: <<{str(errcode)}>>')
         return False
@@ -3660,15 +4328,15 @@ def update_state(open_date, close_date):
     # firewall - close_date must be a string in DATETIME_FORMAT format
     #
     if not isinstance(close_date, str):
-        ioccc_last_errmsg = "ERROR: in " + me + ": close_date is not a string"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": close_date is not a string")
         error(f'{me}: close_date arg is not a string')
         return False
     try:
         # pylint: disable=unused-variable
         close_datetime = datetime.strptime(close_date, DATETIME_FORMAT)
     except ValueError as errcode:
-        ioccc_last_errmsg = "ERROR: in " + me + ": state file close_date is not in proper datetime format: <<" + \
-                      close_date + ">> exception: <<" + str(errcode) + ">>"
+        ioccc_last_errmsg.set("ERROR: in " + me + ": state file close_date is not in proper datetime format: <<" + \
+                      close_date + ">> exception: <<" + str(errcode) + ">>")
         error(f'{me}: datetime.strptime of close_date arg: {close_date} '
               f'failed: <<{str(errcode)}>>')
         return False
@@ -3682,36 +4350,14 @@ def update_state(open_date, close_date):
 
     # write JSON data into the state file
     #
-    try:
-        with open(STATE_FILE, 'w', encoding='utf-8') as sf_fp:
-            t = Template(DEFAULT_JSON_STATE_TEMPLATE)
-            state = json.loads(t.substitute( { 'NO_COMMENT_VALUE': NO_COMMENT_VALUE, \
-                                               'STATE_VERSION_VALUE': STATE_VERSION_VALUE, \
-                                               'OPEN_DATE': open_date, \
-                                               'CLOSE_DATE': close_date } ))
-            sf_fp.write(json.dumps(state,
-                                   ensure_ascii = True,
-                                   indent = 4))
-            sf_fp.write('\n')
-
-            # close state file
-            #
-            # NOTE: We explicitly manage the close because we just did a write
-            #       and we want to catch the case where a write buffer may have
-            #       not been fully flushed to the file.
-            #
-            try:
-                sf_fp.close()
-            except OSError as errcode:
-                error(f'{me}: close writing for STATE_FILE: {STATE_FILE} '
-                      f'failed: <<{str(errcode)}>>')
-                ioccc_last_errmsg = "ERROR: in " + me + ": failed to close: " + STATE_FILE + \
-                                    " exception: " + str(errcode)
-                write_sucessful = False
-                # fall thru
-
-    except OSError:
-        ioccc_last_errmsg = "ERROR: in " + me + ": cannot write state file: " + STATE_FILE
+    # NOTE: This is the python dictionary form of DEFAULT_JSON_STATE_TEMPLATE
+    #
+    state = { "no_comment": NO_COMMENT_VALUE,
+              "state_JSON_format_version": STATE_VERSION_VALUE,
+              "open_date": open_date,
+              "close_date": close_date }
+    if not write_json_file(STATE_FILE, state):
+        error(f'{me}: write_json_file failed for STATE_FILE: {STATE_FILE}')
         write_sucessful = False
         # fall thru
 
@@ -3743,7 +4389,7 @@ def contest_is_open(user_dict):
 
     # setup
     #
-    me = inspect.currentframe().f_code.co_name
+    me = "contest_is_open"
     debug(f'{me}: start')
     now = datetime.now(timezone.utc)
 
@@ -3773,18 +4419,50 @@ def contest_is_open(user_dict):
     return None
 
 
+def return_close_date_str(close_datetime):
+    """
+    Return the close date as a string for display in a template
+
+    Given:
+        close_datetime  close date in datetime format, as returned by contest_is_open()
+
+    Returns:
+        close_datetime as a string without the UTC "+00:00" suffix
+
+    NOTE: When close_datetime is the close date last read from the state file,
+          the string formatted by read_state() is returned.
+    """
+
+    # setup
+    #
+    me = "return_close_date_str"
+    debug(f'{me}: start')
+
+    # use the string formatted by read_state(), if it is for the same close date
+    #
+    if ioccc_state_dates and ioccc_state_dates[3] == close_datetime:
+        return ioccc_state_dates[4]
+
+    # otherwise format the close date
+    #
+    return str(close_datetime).replace('+00:00', '')
+
+
 def return_secret():
     """
     Read a application secret key from the SECRET_FILE, or generate it on the fly.
 
+    The secret is read, or generated, once per process for a given SECRET_FILE,
+    so repeated calls return the same secret.
+
     We try will read the 1st line of the SECRET_FILE, ignoring the newlines.
-    If we cannot, we will generate on a secret the fly for testing using a UUID type 4.
+    If we cannot, we will generate on a secret the fly for testing using secrets.token_hex().
 
     Generating a secret the fly exception case may not work well in production as
     different instances of this app will have different secrets.
 
     Returns:
-        secret randomly generated string or about 64 bytes in length.
+        secret randomly generated string of 2*SECRET_TOKEN_BYTES hex characters
     """
 
     # setup
@@ -3792,10 +4470,34 @@ def return_secret():
     me = inspect.currentframe().f_code.co_name
     debug(f'{me}: start')
 
-    # Try read the 1st line of the SECRET_FILE, ignoring the newline:
+    # return the secret for the current SECRET_FILE
+    #
+    return _load_secret(SECRET_FILE)
+
+
+@lru_cache(maxsize=1)
+def _load_secret(secret_file):
+    """
+    Read a application secret key from a secret file, or generate it on the fly.
+
+    Given:
+        secret_file     file containing the application secret key
+
+    Returns:
+        secret randomly generated string of 2*SECRET_TOKEN_BYTES hex characters
+
+    NOTE: This function is cached, so the secret file is read only once per process.
+    """
+
+    # setup
+    #
+    me = inspect.currentframe().f_code.co_name
+    debug(f'{me}: start')
+
+    # Try read the 1st line of the secret_file, ignoring the newline:
     #
     try:
-        with open(SECRET_FILE, 'r', encoding="utf-8") as secret:
+        with open(secret_file, 'r', encoding="utf-8") as secret:
             secret_key = secret.read().rstrip()
 
     except OSError as errcode:
@@ -3804,23 +4506,23 @@ def return_secret():
         # IMPORTANT: This exception case may not work well in production as
         #            different instances of this app will have different secrets.
         #
-        warning(f'{me}: open SECRET_FILE: {SECRET_FILE} failed: <<{str(errcode)}>>')
-        warning(f'{me}: generating secret_key on the fly: failed to obtain it from SECRET_FILE: {SECRET_FILE}')
-        secret_key = str(uuid.uuid4()) + "//" + str(randrange(1000)) + "." + str(randrange(1000))
+        warning(f'{me}: open secret_file: {secret_file} failed: <<{str(errcode)}>>')
+        warning(f'{me}: generating secret_key on the fly: failed to obtain it from secret_file: {secret_file}')
+        secret_key = secrets.token_hex(SECRET_TOKEN_BYTES)
         # fall thru
 
     # paranoia - not a string
     #
     if not isinstance(secret_key, str):
-        warning(f'{me}: generating secret_key on the fly: non-string found in from SECRET_FILE: {SECRET_FILE}')
-        secret_key = str(uuid.uuid4()) + "/*" + str(randrange(1000)) + "." + str(randrange(1000))
+        warning(f'{me}: generating secret_key on the fly: non-string found in from secret_file: {secret_file}')
+        secret_key = secrets.token_hex(SECRET_TOKEN_BYTES)
         # fall thru
 
     # paranoia - too short
     #
     elif len(secret_key) < MIN_SECRET_LEN:
-        warning(f'{me}: generating secret_key on the fly: string too short in SECRET_FILE: {SECRET_FILE}')
-        secret_key = str(uuid.uuid4()) + "*/" + str(randrange(1000)) + "." + str(randrange(1000))
+        warning(f'{me}: generating secret_key on the fly: string too short in secret_file: {secret_file}')
+        secret_key = secrets.token_hex(SECRET_TOKEN_BYTES)
         # fall thru
 
     # return secret key
@@ -4061,8 +4763,6 @@ def debug(msg, *args, **kwargs):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
     me = inspect.currentframe().f_code.co_name
     # We do NOT want to call debug start from this function because of recursion
     #no# debug(f'{me}: start')
@@ -4072,7 +4772,7 @@ def debug(msg, *args, **kwargs):
             ioccc_logger.debug(msg, *args, **kwargs)
 
         except OSError as errcode:
-            ioccc_last_errmsg = "ERROR: in " + me + ": ioccc_logger.debug failed, exception: " + str(errcode)
+            ioccc_last_errmsg.set("ERROR: in " + me + ": ioccc_logger.debug failed, exception: " + str(errcode))
 
 
 def dbg(msg, *args, **kwargs):
@@ -4106,8 +4806,6 @@ def info(msg, *args, **kwargs):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
     # pylint: disable-next=global-statement,global-variable-not-assigned
     global ioccc_logger
     me = inspect.currentframe().f_code.co_name
@@ -4119,7 +4817,7 @@ def info(msg, *args, **kwargs):
             ioccc_logger.info(msg, *args, **kwargs)
 
         except OSError as errcode:
-            ioccc_last_errmsg = "ERROR: in " + me + ": ioccc_logger.info failed, exception: " + str(errcode)
+            ioccc_last_errmsg.set("ERROR: in " + me + ": ioccc_logger.info failed, exception: " + str(errcode))
 
 
 def warning(msg, *args, **kwargs):
@@ -4134,8 +4832,6 @@ def warning(msg, *args, **kwargs):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
     me = inspect.currentframe().f_code.co_name
     # We do NOT want to call debug start from this function because of recursion
     #no# debug(f'{me}: start')
@@ -4145,7 +4841,7 @@ def warning(msg, *args, **kwargs):
             ioccc_logger.warning(msg, *args, **kwargs)
 
         except OSError as errcode:
-            ioccc_last_errmsg = "ERROR: in " + me + ": ioccc_logger.warning failed, exception: " + str(errcode)
+            ioccc_last_errmsg.set("ERROR: in " + me + ": ioccc_logger.warning failed, exception: " + str(errcode))
 
 
 def warn(msg, *args, **kwargs):
@@ -4179,8 +4875,6 @@ def error(msg, *args, **kwargs):
 
     # setup
     #
-    # pylint: disable-next=global-statement
-    global ioccc_last_errmsg
     me = inspect.currentframe().f_code.co_name
     # We do NOT want to call debug start from this function because of recursion
     #no# debug(f'{me}: start')
@@ -4190,4 +4884,4 @@ def error(msg, *args, **kwargs):
             ioccc_logger.error(msg, *args, **kwargs)
 
         except OSError as errcode:
-            ioccc_last_errmsg = "ERROR: in " + me + ": ioccc_logger.error failed, exception: " + str(errcode)
+            ioccc_last_errmsg.set("ERROR: in " + me + ": ioccc_logger.error failed, exception: " + str(errcode))